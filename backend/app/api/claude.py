@@ -5,12 +5,12 @@ Provides REST API endpoints for Claude Code interactions with real-time
 streaming capabilities for mobile clients.
 """
 
-import json
-import asyncio
+from contextlib import aclosing
 from datetime import datetime
 
+import orjson
 from fastapi import APIRouter, HTTPException, Depends, Query, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from sse_starlette.sse import EventSourceResponse
 
 from app.models.requests import (
@@ -26,6 +26,14 @@ from app.models.responses import (
     HealthResponse,
 )
 from app.services.claude_service import ClaudeService
+from app.utils.logging import StructuredLogger
+
+logger = StructuredLogger(__name__)
+
+
+def _sse_data(payload: dict) -> str:
+    """Encode an SSE data payload; orjson writes datetimes in ISO format itself."""
+    return orjson.dumps(payload).decode()
 
 
 # Create router with prefix
@@ -33,11 +41,8 @@ router = APIRouter(prefix="/claude", tags=["claude"])
 
 
 def get_claude_service(request: Request) -> ClaudeService:
-    """Dependency to provide Claude service with SessionManager integration."""
-    project_root = request.app.state.project_root
-    session_storage = request.app.state.session_storage
-    session_manager = request.app.state.session_manager
-    return ClaudeService(project_root, session_storage, session_manager)
+    """Dependency to provide the shared Claude service created at startup."""
+    return request.app.state.claude_service
 
 
 @router.get("/health", response_model=HealthResponse)
@@ -113,23 +118,25 @@ async def list_sessions(
     List user sessions with pagination.
 
     Returns sessions for the specified user with optional pagination.
+    Rows are built as plain dicts and encoded with orjson; the response model
+    documents the shape but is not instantiated.
     """
     try:
-        sessions = await claude_service.list_user_sessions(
+        sessions = await claude_service.list_user_sessions_raw(
             user_id=user_id, limit=limit, offset=offset
         )
 
         # Calculate if there are more sessions
-        total_user_sessions = len(
-            await claude_service.list_user_sessions(user_id, limit=1000)
-        )
+        total_user_sessions = await claude_service.count_user_sessions(user_id)
         has_more = offset + limit < total_user_sessions
 
-        return SessionListResponse(
-            sessions=sessions,
-            total_count=total_user_sessions,
-            has_more=has_more,
-            next_offset=offset + limit if has_more else None,
+        return ORJSONResponse(
+            content={
+                "sessions": sessions,
+                "total_count": total_user_sessions,
+                "has_more": has_more,
+                "next_offset": offset + limit if has_more else None,
+            }
         )
     except Exception as e:
         raise HTTPException(
@@ -147,22 +154,52 @@ async def get_session(
     """
     Get session details with full message history.
 
-    Returns complete session information including all messages.
+    Returns complete session information including all messages. Like the
+    listing endpoint, the body is built as a plain dict and encoded with orjson.
     """
     try:
-        session = await claude_service.get_session(session_id, user_id)
+        session = await claude_service.get_session_raw(session_id, user_id)
         if not session:
             raise HTTPException(
                 status_code=404,
                 detail=f"Session {session_id} not found or access denied",
             )
-        return session
+        return ORJSONResponse(content=session)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get session: {str(e)}")
 
 
+@router.post("/sessions/{session_id}/warm")
+async def warm_session(
+    session_id: str,
+    request: Request,
+    user_id: str = Query(..., description="User identifier"),
+    claude_service: ClaudeService = Depends(get_claude_service),
+):
+    """
+    Connect a session's persistent Claude client ahead of the first query.
+
+    Clients call this when the user opens a session, so the SDK handshake
+    overlaps with typing instead of delaying the first response. Warming is
+    skipped when the server is already at its live client limit.
+    """
+    try:
+        session = await claude_service.get_session_raw(session_id, user_id)
+        if not session:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Session {session_id} not found or access denied",
+            )
+        warmed = await claude_service.warm_session(session_id)
+        return ORJSONResponse(content={"session_id": session_id, "warmed": warmed})
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to warm session: {str(e)}")
+
+
 @router.post("/query", response_model=ClaudeQueryResponse)
 async def query_claude(
     query_request: ClaudeQueryRequest,
@@ -194,9 +231,6 @@ async def stream_claude_response(
     request: Request,
     claude_service: ClaudeService = Depends(get_claude_service),
 ):
-    print(f"🎯 API: Stream endpoint called for session {query_request.session_id}")
-    print(f"🎯 API: Query: {query_request.query[:50]}...")
-    print(f"🎯 API: User ID: {query_request.user_id}")
     """
     Stream Claude's response in real-time using Server-Sent Events.
 
@@ -207,6 +241,14 @@ async def stream_claude_response(
     - data: JSON chunk with content, chunk_type, message_id, timestamp
     - event: chunk_type (delta, complete, error)
     """
+    logger.debug(
+        "Stream endpoint called: %.50s",
+        query_request.query,
+        category="api",
+        operation="stream",
+        session_id=query_request.session_id,
+        user_id=query_request.user_id,
+    )
 
     async def event_generator():
         """
@@ -214,43 +256,35 @@ async def stream_claude_response(
 
         Converts StreamingChunk objects to SSE format for real-time transmission.
         """
-        print(
-            f"🎯 API: Starting event generator for session {query_request.session_id}"
-        )
         try:
             # Validate session exists
-            print(
-                f"🎯 API: Validating session {query_request.session_id} for user {query_request.user_id}"
-            )
-            session = await claude_service.get_session(
+            session = await claude_service.get_session_raw(
                 query_request.session_id, query_request.user_id
             )
-            print(f"🎯 API: Session validation result: {session is not None}")
             if not session:
                 error_data = {
                     "content": None,
                     "chunk_type": "error",
                     "message_id": None,
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": datetime.utcnow(),
                     "error": "session_not_found",
                     "message": f"Session {query_request.session_id} not found or access denied",
                 }
-                print(f"🎯 API: Sending session not found error: {error_data}")
                 yield {
                     "event": "error",
-                    "data": json.dumps(error_data),
+                    "data": _sse_data(error_data),
                 }
                 return
 
             # Start streaming
             yield {
                 "event": "start",
-                "data": json.dumps(
+                "data": _sse_data(
                     {
                         "content": "Starting Claude response stream",
                         "chunk_type": "start",
                         "message_id": None,
-                        "timestamp": datetime.utcnow().isoformat(),
+                        "timestamp": datetime.utcnow(),
                         "session_id": query_request.session_id,
                     }
                 ),
@@ -260,44 +294,47 @@ async def stream_claude_response(
             options = query_request.options or ClaudeCodeOptions()
 
             # Stream Claude response chunks
-            print("🎯 API: About to start streaming from Claude service")
-            async for chunk in claude_service.stream_response(query_request, options):
-                print(f"🎯 API: Received chunk from Claude service: {chunk.chunk_type}")
-                chunk_data = {
-                    "content": chunk.content,
-                    "chunk_type": chunk.chunk_type,
-                    "message_id": chunk.message_id,
-                    "timestamp": chunk.timestamp.isoformat(),
-                }
-
-                yield {"event": chunk.chunk_type, "data": json.dumps(chunk_data)}
-
-                # Add small delay to prevent overwhelming mobile clients
-                await asyncio.sleep(0.01)
+            # aclosing() shuts the service stream down as soon as the client goes
+            # away instead of leaving it suspended until garbage collection
+            async with aclosing(
+                claude_service.stream_response(query_request, options)
+            ) as chunks:
+                async for chunk in chunks:
+                    # sse_starlette passes bytes through untouched, so hand it the
+                    # finished frame instead of a dict it would re-encode
+                    yield chunk.to_sse()
 
         except ValueError as e:
             yield {
                 "event": "error",
-                "data": json.dumps(
+                "data": _sse_data(
                     {
                         "content": None,
                         "chunk_type": "error",
                         "message_id": None,
-                        "timestamp": datetime.utcnow().isoformat(),
+                        "timestamp": datetime.utcnow(),
                         "error": "validation_error",
                         "message": str(e),
                     }
                 ),
             }
         except Exception as e:
+            logger.error(
+                "Stream endpoint failed: %s",
+                e,
+                category="api",
+                operation="stream",
+                session_id=query_request.session_id,
+                exc_info=True,
+            )
             yield {
                 "event": "error",
-                "data": json.dumps(
+                "data": _sse_data(
                     {
                         "content": None,
                         "chunk_type": "error",
                         "message_id": None,
-                        "timestamp": datetime.utcnow().isoformat(),
+                        "timestamp": datetime.utcnow(),
                         "error": "internal_error",
                         "message": f"Streaming failed: {str(e)}",
                     }
@@ -337,7 +374,9 @@ async def update_session(
 
     try:
         # Get current session to verify access
-        session = await claude_service.get_session(session_id, update_request.user_id)
+        session = await claude_service.get_session_raw(
+            session_id, update_request.user_id
+        )
         if not session:
             raise HTTPException(
                 status_code=404,
@@ -347,7 +386,7 @@ async def update_session(
         # Update session properties
         # Note: In a full implementation, you'd need to add update methods to ClaudeService
         # For now, return the existing session as this is a minimal implementation
-        return session
+        return ORJSONResponse(content=session)
 
     except HTTPException:
         raise
@@ -6,6 +6,7 @@ consistent session storage across FastAPI worker restarts and Docker deployments
 """
 
 import os
+import asyncio
 from pathlib import Path
 from contextlib import asynccontextmanager
 from datetime import datetime
@@ -14,6 +15,17 @@ from fastapi import FastAPI
 from app.utils.logging import setup_logging, StructuredLogger
 from app.utils.session_storage import PersistentSessionStorage
 from app.services.session_manager import SessionManager
+from app.services.claude_service import ClaudeService
+
+
+async def _flush_session_touches(
+    session_storage: PersistentSessionStorage, interval: float = 1.0
+) -> None:
+    """Periodically persist queued session touches off the event loop."""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        await loop.run_in_executor(None, session_storage.flush_touches)
 
 
 @asynccontextmanager
@@ -75,9 +87,17 @@ async def lifespan(app: FastAPI):
     session_manager = SessionManager(
         session_timeout=3600,  # 1 hour inactivity timeout
         cleanup_interval=300,  # Check every 5 minutes
+        max_sessions=1000,  # Evict least recently used clients beyond this
+        max_turns_per_user=4,  # Concurrent query turns per user
     )
     app.state.session_manager = session_manager
 
+    # One ClaudeService shared by every request and the startup warmup
+    claude_service = ClaudeService(
+        project_root, app.state.session_storage, session_manager
+    )
+    app.state.claude_service = claude_service
+
     logger.info(
         "Working directory, session storage, and SessionManager configured",
         category="lifecycle",
@@ -87,6 +107,17 @@ async def lifespan(app: FastAPI):
         session_manager_initialized=True,
     )
 
+    # Pre-connect clients for sessions used in the last 10 minutes in the background
+    # so the first query after a restart skips the Claude SDK handshake
+    app.state.warmup_task = asyncio.create_task(
+        claude_service.warm_recent_sessions(since_seconds=600)
+    )
+
+    # Batch last-used timestamp updates into one storage write per second
+    app.state.touch_flush_task = asyncio.create_task(
+        _flush_session_touches(app.state.session_storage)
+    )
+
     # Create Claude config directory if it doesn't exist
     claude_dir = Path(claude_home)
     if not claude_dir.exists():
@@ -115,6 +146,25 @@ async def lifespan(app: FastAPI):
         timestamp=datetime.utcnow().isoformat(),
     )
 
+    # Stop session warmup if it is still connecting clients
+    warmup_task = getattr(app.state, "warmup_task", None)
+    if warmup_task and not warmup_task.done():
+        warmup_task.cancel()
+        try:
+            await warmup_task
+        except asyncio.CancelledError:
+            pass
+
+    # Stop the touch flusher and persist whatever it had not written yet
+    touch_flush_task = getattr(app.state, "touch_flush_task", None)
+    if touch_flush_task:
+        touch_flush_task.cancel()
+        try:
+            await touch_flush_task
+        except asyncio.CancelledError:
+            pass
+        app.state.session_storage.flush_touches()
+
     # Cleanup SessionManager and all persistent clients
     if hasattr(app.state, "session_manager"):
         try:
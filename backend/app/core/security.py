@@ -17,7 +17,7 @@ from app.core.config import get_settings, Settings
 
 # Rate limiting storage (in-memory for development)
 # In production, use Redis or similar distributed storage
-_rate_limit_storage: Dict[str, Dict[str, int]] = {}
+_rate_limit_storage: Dict[str, Dict[int, int]] = {}
 
 
 class RateLimiter:
@@ -36,16 +36,12 @@ class RateLimiter:
         current_time = int(time.time())
         window_start = current_time - self.window_seconds
 
-        # Initialize storage for identifier if not exists
-        if identifier not in _rate_limit_storage:
-            _rate_limit_storage[identifier] = {}
-
-        user_requests = _rate_limit_storage[identifier]
+        # Per-minute request counts for this identifier, created on first use
+        user_requests = _rate_limit_storage.setdefault(identifier, {})
 
         # Clean old entries
-        for timestamp in list(user_requests.keys()):
-            if int(timestamp) < window_start:
-                del user_requests[timestamp]
+        for timestamp in [t for t in user_requests if t < window_start]:
+            del user_requests[timestamp]
 
         # Count current window requests
         current_requests = sum(user_requests.values())
@@ -54,7 +50,7 @@ class RateLimiter:
             return False
 
         # Record this request
-        current_minute = str(current_time // 60 * 60)
+        current_minute = current_time // 60 * 60
         user_requests[current_minute] = user_requests.get(current_minute, 0) + 1
 
         return True
@@ -15,6 +15,7 @@ from fastapi.exceptions import RequestValidationError
 
 from app.api import claude
 from app.models.responses import ErrorResponse, HealthResponse
+from app.core.config import get_settings
 from app.core.lifecycle import lifespan, verify_session_storage
 
 
@@ -180,4 +181,10 @@ if __name__ == "__main__":
     print("📖 API Documentation: http://localhost:8000/docs")
     print("🔄 Interactive API: http://localhost:8000/redoc")
 
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True, log_level="info")
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=True,
+        log_level=get_settings().log_level.lower(),
+    )
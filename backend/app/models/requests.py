@@ -18,6 +18,14 @@ class ClaudeCodeOptions(BaseModel):
     max_tokens: Optional[int] = Field(8192, description="Maximum tokens in response")
     temperature: Optional[float] = Field(0.7, description="Response creativity level")
     timeout: Optional[int] = Field(60, description="Request timeout in seconds")
+    system_prompt: Optional[str] = Field(
+        None,
+        description=(
+            "Stable instructions appended to the Claude Code system prompt. "
+            "Applied when the session client is created so the prefix is reused "
+            "from Anthropic's prompt cache on every turn"
+        ),
+    )
 
 
 class SessionRequest(BaseModel):
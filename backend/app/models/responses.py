@@ -4,6 +4,7 @@ Response models for the Claude Code FastAPI backend.
 Pydantic models for API responses ensuring type safety and consistent data structures.
 """
 
+import orjson
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
@@ -72,6 +73,36 @@ class StreamingChunk(BaseModel):
         default_factory=datetime.utcnow, description="Chunk timestamp"
     )
 
+    def to_bytes(self) -> bytes:
+        """Encode the SSE payload for this chunk as JSON bytes."""
+        return orjson.dumps(
+            {
+                "content": self.content,
+                "chunk_type": self.chunk_type,
+                "message_id": self.message_id,
+                "timestamp": self.timestamp,
+            }
+        )
+
+    def to_sse(self, sep: bytes = b"\r\n") -> bytes:
+        """
+        Encode this chunk as a complete Server-Sent Events frame.
+
+        orjson escapes newlines inside strings, so the payload always fits on a
+        single data line and the frame can be assembled without re-parsing.
+        """
+        return b"".join(
+            (
+                b"event: ",
+                self.chunk_type.value.encode(),
+                sep,
+                b"data: ",
+                self.to_bytes(),
+                sep,
+                sep,
+            )
+        )
+
 
 class SessionResponse(BaseModel):
     """Response containing session information."""
@@ -5,11 +5,18 @@ Uses Claude SDK's native session management with working directories as project
 eliminating complex path computation and aligning with Claude CLI behavior.
 """
 
+import os
 import uuid
+import secrets
+import time
+import functools
+import itertools
+import logging
 import asyncio
+from contextlib import aclosing
 from pathlib import Path
-from datetime import datetime
-from typing import Optional, AsyncGenerator, List
+from datetime import datetime, timedelta
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
 from app.models.requests import (
     ClaudeQueryRequest,
@@ -33,6 +40,132 @@ from app.utils.logging import StructuredLogger
 from app.utils.session_storage import PersistentSessionStorage
 from app.services.session_manager import SessionManager
 
+# Resolved working directories, keyed by the raw request value
+_WORKING_DIR_CACHE_TTL = 60.0
+_WORKING_DIR_CACHE_SIZE = 256
+_working_dir_cache: Dict[str, Tuple[str, float]] = {}
+
+# Attempts at getting a session's persistent client before a query gives up
+_CLIENT_ATTEMPTS = 2
+
+
+def _resolve_working_dir(raw: str) -> str:
+    """
+    Expand and validate a working directory.
+
+    Args:
+        raw: Working directory as given in the request
+
+    Returns:
+        str: Resolved working directory path
+
+    Raises:
+        ValueError: If the path does not exist or is not a directory
+    """
+    working_dir = os.path.expanduser(raw) if raw.startswith("~") else raw
+    if not os.path.isdir(working_dir):
+        raise ValueError(
+            f"Working directory does not exist or is not a directory: {working_dir}"
+        )
+    return working_dir
+
+
+class _SessionContext(dict):
+    """Read-only session context, shared by every response for one working directory."""
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Session context is read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+
+@functools.lru_cache(maxsize=256)
+def _session_context(working_directory: Optional[str]) -> _SessionContext:
+    """Return the shared context dict for a working directory."""
+    return _SessionContext(working_directory=working_directory)
+
+
+async def _resolve_working_dir_cached(raw: str) -> str:
+    """
+    Resolve a working directory, reusing recent successful lookups.
+
+    Only existing directories are cached, and only for a short TTL, so a directory
+    created or removed after a lookup is picked up soon after. Misses hit the
+    filesystem in the default executor to keep slow mounts off the event loop.
+    """
+    now = time.monotonic()
+    cached = _working_dir_cache.get(raw)
+    if cached and cached[1] > now:
+        return cached[0]
+
+    working_dir = await asyncio.get_running_loop().run_in_executor(
+        None, _resolve_working_dir, raw
+    )
+
+    _working_dir_cache.pop(raw, None)
+    if len(_working_dir_cache) >= _WORKING_DIR_CACHE_SIZE:
+        # Dicts keep insertion order, so the first key is the oldest entry
+        del _working_dir_cache[next(iter(_working_dir_cache))]
+    _working_dir_cache[raw] = (working_dir, now + _WORKING_DIR_CACHE_TTL)
+    return working_dir
+
+
+def _format_tool_use(block: Any) -> Tuple[ChunkType, str, Dict[str, Any]]:
+    """Format a ToolUseBlock as a display chunk."""
+    tool_name = getattr(block, "name", "unknown")
+    tool_input = getattr(block, "input", {})
+    tool_id = getattr(block, "id", "")
+    tool_input_text = str(tool_input)
+
+    # Format tool usage message for display
+    if tool_name == "Bash":
+        command = tool_input.get("command", "")
+        description = tool_input.get("description", "")
+        content = f"🔧 Running: {description}\n```bash\n{command}\n```" if description else f"🔧 Running command:\n```bash\n{command}\n```"
+    elif tool_input:
+        content = f"🔧 Using {tool_name} with parameters: {tool_input_text[:100]}..."
+    else:
+        content = f"🔧 Using {tool_name}"
+
+    return ChunkType.TOOL, content, {
+        "tool_name": tool_name,
+        "tool_input": tool_input_text,
+        "tool_id": tool_id
+    }
+
+
+def _format_tool_result(block: Any) -> Tuple[ChunkType, str, Dict[str, Any]]:
+    """Format a ToolResultBlock as a display chunk."""
+    tool_content = str(getattr(block, "content", ""))
+    tool_use_id = getattr(block, "tool_use_id", "")
+    is_error = getattr(block, "is_error", False)
+
+    # Format tool result for display
+    if is_error:
+        content = f"❌ Tool Error:\n```\n{tool_content}\n```"
+    else:
+        # Truncate very long results for better UX
+        if len(tool_content) > 1000:
+            content = f"📋 Tool Result:\n```\n{tool_content[:1000]}...\n[Output truncated]\n```"
+        else:
+            content = f"📋 Tool Result:\n```\n{tool_content}\n```"
+
+    return ChunkType.TOOL_RESULT, content, {
+        "tool_use_id": tool_use_id,
+        "is_error": is_error
+    }
+
+
+# Non-text content blocks, keyed by SDK class name. Dispatch goes by name rather
+# than isinstance so it doesn't depend on importing the SDK block classes.
+_TOOL_BLOCK_FORMATTERS = {
+    "ToolUseBlock": _format_tool_use,
+    "ToolResultBlock": _format_tool_result,
+}
+
 
 class ClaudeService:
     """
@@ -42,6 +175,17 @@ class ClaudeService:
     overhead and maintaining conversation context across queries.
     """
 
+    # One instance is shared by every request (app.state.claude_service); slots keep
+    # its hot attribute reads fast and stop per-request state being stashed on it.
+    # Any new instance attribute must be declared here.
+    __slots__ = (
+        "project_root",
+        "_project_root_str",
+        "session_storage",
+        "session_manager",
+        "logger",
+    )
+
     def __init__(
         self,
         project_root: Path,
@@ -49,6 +193,7 @@ class ClaudeService:
         session_manager: SessionManager,
     ):
         self.project_root = project_root
+        self._project_root_str = str(project_root)
         self.session_storage = session_storage
         self.session_manager = session_manager
         self.logger = StructuredLogger(__name__)
@@ -57,30 +202,86 @@ class ClaudeService:
             "Claude service initialized with SessionManager integration",
             category="session_management",
             operation="init",
-            project_root=str(project_root),
+            project_root=self._project_root_str,
             storage_type="persistent",
             session_manager_enabled=True,
         )
 
+    @staticmethod
+    def _build_session_response(
+        session_id: str,
+        user_id: str,
+        session_name: Optional[str],
+        working_directory: Optional[str],
+        created_at: datetime,
+        updated_at: datetime,
+    ) -> SessionResponse:
+        """
+        Build a SessionResponse from trusted internal data.
+
+        Uses model_construct to skip Pydantic validation, since every field is
+        produced by this service or read back from our own session storage.
+        """
+        return SessionResponse.model_construct(
+            session_id=session_id,
+            user_id=user_id,
+            session_name=session_name or f"Session {session_id[:8]}",
+            status=SessionStatus.ACTIVE,
+            messages=[],  # Messages are handled by Claude SDK
+            created_at=created_at,
+            updated_at=updated_at,
+            message_count=0,  # Will be populated from Claude SDK if needed
+            context=_session_context(working_directory),
+        )
+
+    @classmethod
+    def _session_response_from_metadata(
+        cls, session_metadata: Dict[str, Any]
+    ) -> SessionResponse:
+        """Build a SessionResponse from a persistent storage metadata record."""
+        created_at = session_metadata["created_at"]
+        return cls._build_session_response(
+            session_id=session_metadata["session_id"],
+            user_id=session_metadata["user_id"],
+            session_name=session_metadata.get("session_name"),
+            working_directory=session_metadata.get("working_directory"),
+            created_at=datetime.fromisoformat(created_at),
+            updated_at=datetime.fromisoformat(
+                session_metadata.get("updated_at", created_at)
+            ),
+        )
+
+    @staticmethod
+    def _session_meta_to_dict(session_metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape a storage metadata record exactly like a serialized SessionResponse."""
+        session_id = session_metadata["session_id"]
+        created_at = session_metadata["created_at"]
+        return {
+            "session_id": session_id,
+            "user_id": session_metadata["user_id"],
+            "session_name": session_metadata.get("session_name")
+            or f"Session {session_id[:8]}",
+            "status": SessionStatus.ACTIVE.value,
+            "messages": [],
+            "created_at": created_at,
+            "updated_at": session_metadata.get("updated_at", created_at),
+            "message_count": 0,
+            "context": _session_context(session_metadata.get("working_directory")),
+        }
+
     async def create_session(self, request: SessionRequest) -> SessionResponse:
         """Create a new Claude Code session using SessionManager for persistent clients."""
 
         # Use specified working directory or default to project root
-        working_dir = getattr(request, "working_directory", None) or str(
-            self.project_root
-        )
-
-        # Expand user home directory (~) if present
-        if working_dir and working_dir.startswith("~"):
-            working_dir = str(Path(working_dir).expanduser())
+        working_dir = request.working_directory or self._project_root_str
 
-        # Validate that the working directory exists
-        if working_dir and not Path(working_dir).exists():
-            raise ValueError(f"Working directory does not exist: {working_dir}")
+        # Expand ~ and validate that the working directory exists
+        working_dir = await _resolve_working_dir_cached(working_dir)
 
         try:
             self.logger.info(
-                f"Creating Claude SDK session with SessionManager: {working_dir}",
+                "Creating Claude SDK session with SessionManager: %s",
+                working_dir,
                 category="session_management",
                 operation="create_session",
                 working_directory=working_dir,
@@ -89,6 +290,9 @@ class ClaudeService:
 
             # Generate a temporary session ID - will be replaced by Claude SDK's ID
             temp_session_id = str(uuid.uuid4())
+            system_prompt = (
+                request.claude_options.system_prompt if request.claude_options else None
+            )
 
             # Create persistent client through SessionManager
             # The SessionManager will return the Claude SDK's actual session ID
@@ -97,17 +301,17 @@ class ClaudeService:
                 working_dir=working_dir,
                 user_id=request.user_id,
                 is_new_session=True,
+                system_prompt=system_prompt,
             )
 
-            # Get the actual session ID that Claude SDK created
-            actual_session_id = temp_session_id
-            if hasattr(client, "session_id") and client.session_id:
-                actual_session_id = client.session_id
-            # Also check if SessionManager stored a different ID
-            elif temp_session_id in self.session_manager.active_sessions:
-                session_info = self.session_manager.active_sessions[temp_session_id]
-                if "claude_session_id" in session_info:
-                    actual_session_id = session_info["claude_session_id"]
+            # Get the actual session ID that Claude SDK created, falling back to
+            # the one SessionManager recorded on the session's record
+            actual_session_id = getattr(client, "session_id", None)
+            if not actual_session_id:
+                session_info = self.session_manager.active_sessions.get(temp_session_id)
+                actual_session_id = (
+                    session_info and session_info.claude_session_id
+                ) or temp_session_id
 
             self.logger.info(
                 "SessionManager created persistent client",
@@ -118,30 +322,31 @@ class ClaudeService:
                 working_directory=working_dir,
             )
 
-            # Store session metadata persistently for UI listing
-            session_name = (
-                getattr(request, "session_name", None)
-                or f"Session {actual_session_id[:8]}"
-            )
-            self.session_storage.store_session(
-                session_id=actual_session_id,
-                user_id=request.user_id,
-                working_directory=working_dir,
-                session_name=session_name,
-                created_at=datetime.utcnow(),
+            # Store session metadata persistently for UI listing; the write
+            # rewrites the whole storage file, so keep it off the event loop
+            session_name = request.session_name or f"Session {actual_session_id[:8]}"
+            now = datetime.utcnow()
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                functools.partial(
+                    self.session_storage.store_session,
+                    session_id=actual_session_id,
+                    user_id=request.user_id,
+                    working_directory=working_dir,
+                    session_name=session_name,
+                    created_at=now,
+                    system_prompt=system_prompt,
+                ),
             )
 
             # Create session response
-            session_response = SessionResponse(
+            session_response = self._build_session_response(
                 session_id=actual_session_id,
                 user_id=request.user_id,
                 session_name=session_name,
-                status=SessionStatus.ACTIVE,
-                messages=[],
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow(),
-                message_count=0,
-                context={"working_directory": working_dir},
+                working_directory=working_dir,
+                created_at=now,
+                updated_at=now,
             )
 
             self.logger.info(
@@ -157,7 +362,8 @@ class ClaudeService:
 
         except Exception as e:
             self.logger.error(
-                f"Session creation failed: {e}",
+                "Session creation failed: %s",
+                e,
                 category="session_management",
                 user_id=request.user_id,
                 operation="create_session_failed",
@@ -172,7 +378,7 @@ class ClaudeService:
         """Send a query to Claude using persistent SessionManager clients."""
 
         try:
-            start_time = datetime.utcnow()
+            start_time = time.perf_counter()
 
             # Get working directory from persistent session storage
             session_metadata = self.session_storage.get_session(request.session_id)
@@ -191,21 +397,23 @@ class ClaudeService:
             )
 
             # Get persistent client from SessionManager with retry logic
-            max_retries = 2
             client = None
-            for attempt in range(max_retries):
+            for attempt in range(_CLIENT_ATTEMPTS):
                 try:
                     client = await self.session_manager.get_or_create_session(
                         session_id=request.session_id,
                         working_dir=working_dir,
                         user_id=request.user_id,
                         is_new_session=False,
+                        system_prompt=session_metadata.get("system_prompt"),
                     )
                     break  # Success
                 except Exception as e:
-                    if attempt < max_retries - 1:
+                    if attempt < _CLIENT_ATTEMPTS - 1:
                         self.logger.warning(
-                            f"Query attempt {attempt + 1} failed, retrying: {e}",
+                            "Query attempt %d failed, retrying: %s",
+                            attempt + 1,
+                            e,
                             category="query_execution",
                             session_id=request.session_id,
                             attempt=attempt + 1,
@@ -214,28 +422,38 @@ class ClaudeService:
                     else:
                         raise
 
-            # Send query to persistent client
-            await client.query(request.query)
-
-            # Collect response content
-            response_content = ""
-            async for message in client.receive_response():
-                if hasattr(message, "content"):
-                    for block in message.content:
-                        if hasattr(block, "text"):
-                            response_content += block.text
-
-            processing_time = (datetime.utcnow() - start_time).total_seconds()
+            # One query/response turn at a time on the shared client, and a
+            # bounded number of turns per user across their sessions
+            async with self.session_manager.turn_lock(
+                request.session_id
+            ), self.session_manager.user_turn_slots(request.user_id):
+                # Send query to persistent client
+                await client.query(request.query)
 
-            # Create assistant message response
-            assistant_message = ClaudeMessage(
-                id=str(uuid.uuid4()),
-                content=response_content,
+                # Collect response content
+                response_parts = []
+                async for message in client.receive_response():
+                    content = getattr(message, "content", None)
+                    if content is not None:
+                        for block in content:
+                            text = getattr(block, "text", None)
+                            if text is not None:
+                                response_parts.append(text)
+
+            processing_time = time.perf_counter() - start_time
+
+            # Create assistant message response. Every field is built here from
+            # trusted values, so skip Pydantic validation.
+            assistant_message = ClaudeMessage.model_construct(
+                id=secrets.token_hex(16),
+                content="".join(response_parts),
                 role=MessageRole.ASSISTANT,
                 timestamp=datetime.utcnow(),
                 session_id=request.session_id,
             )
 
+            await self.touch(request.session_id)
+
             self.logger.info(
                 "Query completed successfully with SessionManager",
                 category="query_execution",
@@ -245,7 +463,7 @@ class ClaudeService:
                 processing_time=processing_time,
             )
 
-            return ClaudeQueryResponse(
+            return ClaudeQueryResponse.model_construct(
                 session_id=request.session_id,
                 message=assistant_message,
                 processing_time=processing_time,
@@ -253,7 +471,8 @@ class ClaudeService:
 
         except Exception as e:
             self.logger.error(
-                f"Query failed: {e}",
+                "Query failed: %s",
+                e,
                 category="query_execution",
                 session_id=request.session_id,
                 user_id=request.user_id,
@@ -267,6 +486,11 @@ class ClaudeService:
     ) -> AsyncGenerator[StreamingChunk, None]:
         """Stream Claude's response using persistent SessionManager clients."""
 
+        # Chunk IDs share one random base per stream plus a counter, instead of
+        # drawing fresh random bytes for every chunk
+        chunk_id_base = secrets.token_hex(16)
+        next_chunk_index = itertools.count().__next__
+
         try:
             # Get working directory from persistent session storage
             session_metadata = self.session_storage.get_session(request.session_id)
@@ -285,128 +509,155 @@ class ClaudeService:
             )
 
             # Yield start chunk
-            yield StreamingChunk(
+            yield StreamingChunk.model_construct(
                 chunk_type=ChunkType.START,
                 content=None,
-                message_id=str(uuid.uuid4()),
+                message_id=f"{chunk_id_base}-{next_chunk_index()}",
                 session_id=request.session_id,
             )
 
             # Get persistent client from SessionManager with retry logic
-            max_retries = 2
             client = None
-            for attempt in range(max_retries):
+            for attempt in range(_CLIENT_ATTEMPTS):
                 try:
                     client = await self.session_manager.get_or_create_session(
                         session_id=request.session_id,
                         working_dir=working_dir,
                         user_id=request.user_id,
                         is_new_session=False,
+                        system_prompt=session_metadata.get("system_prompt"),
                     )
                     break  # Success
                 except Exception as e:
-                    if attempt < max_retries - 1:
+                    if attempt < _CLIENT_ATTEMPTS - 1:
                         self.logger.warning(
-                            f"Stream attempt {attempt + 1} failed, retrying: {e}",
+                            "Stream attempt %d failed, retrying: %s",
+                            attempt + 1,
+                            e,
                             category="query_execution",
                             session_id=request.session_id,
                             attempt=attempt + 1,
                         )
                         await asyncio.sleep(0.5 * (attempt + 1))
                     else:
-                        raise RuntimeError(f"Failed to get session after {max_retries} attempts: {e}")
-
-            # Send query to persistent client with error handling
-            try:
-                await client.query(request.query)
-            except Exception as e:
-                self.logger.error(
-                    f"Failed to send query to Claude SDK: {e}",
-                    category="query_execution",
-                    session_id=request.session_id,
-                    error=str(e),
-                )
-                raise RuntimeError(f"Query failed: {e}")
-
-            # Stream response chunks with proper Claude Code SDK message type handling
-            async for message in client.receive_response():
-                # Handle AssistantMessage and UserMessage (which contain content blocks)
-                if hasattr(message, "content") and message.content:
-                    for block in message.content:
-                        block_type = block.__class__.__name__
-
-                        if block_type == "TextBlock" and hasattr(block, "text"):
-                            yield StreamingChunk(
-                                chunk_type=ChunkType.DELTA,
-                                content=block.text,
-                                message_id=str(uuid.uuid4()),
-                                session_id=request.session_id,
-                            )
+                        raise RuntimeError(
+                            f"Failed to get session after {_CLIENT_ATTEMPTS} attempts: {e}"
+                        )
 
-                        elif block_type == "ToolUseBlock":
-                            tool_name = getattr(block, "name", "unknown")
-                            tool_input = getattr(block, "input", {})
-                            tool_id = getattr(block, "id", "")
-
-                            # Format tool usage message for display
-                            if tool_name == "Bash":
-                                command = tool_input.get("command", "")
-                                description = tool_input.get("description", "")
-                                content = f"🔧 Running: {description}\n```bash\n{command}\n```" if description else f"🔧 Running command:\n```bash\n{command}\n```"
-                            else:
-                                content = f"🔧 Using {tool_name}"
-                                if tool_input:
-                                    content += f" with parameters: {str(tool_input)[:100]}..."
-
-                            yield StreamingChunk(
-                                chunk_type=ChunkType.TOOL,
+            # One query/response turn at a time on the shared client, and a
+            # bounded number of turns per user across their sessions; both are
+            # held until the response is fully streamed or the consumer goes away
+            async with self.session_manager.turn_lock(
+                request.session_id
+            ), self.session_manager.user_turn_slots(request.user_id):
+                # Send query to persistent client with error handling
+                try:
+                    await client.query(request.query)
+                except Exception as e:
+                    self.logger.error(
+                        "Failed to send query to Claude SDK: %s",
+                        e,
+                        category="query_execution",
+                        session_id=request.session_id,
+                        error=str(e),
+                    )
+                    raise RuntimeError(f"Query failed: {e}")
+
+                # Bind per-chunk lookups to locals; the loop body runs once per block.
+                # Chunks are built from SDK output we already trust, so skip validation.
+                session_id = request.session_id
+                Chunk = StreamingChunk.model_construct
+                DELTA = ChunkType.DELTA
+
+                # Adjacent text blocks within one SDK message are sent as a single
+                # delta; text is never held across messages, since the SDK may
+                # pause for seconds before the next one (e.g. while the model
+                # writes a tool input). The SDK stream is only ever read from
+                # this task, since its anyio internals are bound to the task that
+                # iterates them.
+                text_parts: List[str] = []
+
+                # Stream response chunks with proper Claude Code SDK message type handling.
+                # aclosing() releases the SDK response stream right away if our own
+                # consumer stops early.
+                async with aclosing(client.receive_response()) as messages:
+                    async for message in messages:
+                        # Handle AssistantMessage and UserMessage (which contain content blocks)
+                        blocks = getattr(message, "content", None)
+                        if not blocks:
+                            continue
+
+                        # One timestamp for every chunk produced from this message
+                        now = datetime.utcnow()
+
+                        first = blocks[0]
+                        if len(blocks) == 1 and first.__class__.__name__ == "TextBlock":
+                            # Fast path for the common single-text-block message
+                            text = getattr(first, "text", None)
+                            if text:
+                                yield Chunk(
+                                    chunk_type=DELTA,
+                                    content=text,
+                                    message_id=f"{chunk_id_base}-{next_chunk_index()}",
+                                    session_id=session_id,
+                                    timestamp=now,
+                                )
+                            continue
+
+                        for block in blocks:
+                            block_type = block.__class__.__name__
+
+                            if block_type == "TextBlock":
+                                text = getattr(block, "text", None)
+                                if text is not None:
+                                    text_parts.append(text)
+                                continue
+
+                            if text_parts:
+                                yield Chunk(
+                                    chunk_type=DELTA,
+                                    content="".join(text_parts),
+                                    message_id=f"{chunk_id_base}-{next_chunk_index()}",
+                                    session_id=session_id,
+                                    timestamp=now,
+                                )
+                                text_parts.clear()
+
+                            formatter = _TOOL_BLOCK_FORMATTERS.get(block_type)
+                            if formatter is None:
+                                continue
+
+                            chunk_type, content, metadata = formatter(block)
+                            yield Chunk(
+                                chunk_type=chunk_type,
                                 content=content,
-                                message_id=str(uuid.uuid4()),
-                                session_id=request.session_id,
-                                metadata={
-                                    "tool_name": tool_name,
-                                    "tool_input": str(tool_input),
-                                    "tool_id": tool_id
-                                }
+                                message_id=f"{chunk_id_base}-{next_chunk_index()}",
+                                session_id=session_id,
+                                metadata=metadata,
+                                timestamp=now,
                             )
 
-                        elif block_type == "ToolResultBlock":
-                            tool_content = getattr(block, "content", "")
-                            tool_use_id = getattr(block, "tool_use_id", "")
-                            is_error = getattr(block, "is_error", False)
-
-                            # Format tool result for display
-                            if is_error:
-                                content = f"❌ Tool Error:\n```\n{tool_content}\n```"
-                            else:
-                                # Truncate very long results for better UX
-                                if len(str(tool_content)) > 1000:
-                                    content = f"📋 Tool Result:\n```\n{str(tool_content)[:1000]}...\n[Output truncated]\n```"
-                                else:
-                                    content = f"📋 Tool Result:\n```\n{tool_content}\n```"
-
-                            yield StreamingChunk(
-                                chunk_type=ChunkType.TOOL_RESULT,
-                                content=content,
-                                message_id=str(uuid.uuid4()),
-                                session_id=request.session_id,
-                                metadata={
-                                    "tool_use_id": tool_use_id,
-                                    "is_error": is_error
-                                }
+                        # Text at the end of a message goes out before the next read
+                        if text_parts:
+                            yield Chunk(
+                                chunk_type=DELTA,
+                                content="".join(text_parts),
+                                message_id=f"{chunk_id_base}-{next_chunk_index()}",
+                                session_id=session_id,
+                                timestamp=now,
                             )
-
-                        # Mobile optimization - preserve existing pattern
-                        await asyncio.sleep(0.01)
+                            text_parts.clear()
 
             # Yield completion chunk
-            yield StreamingChunk(
+            yield StreamingChunk.model_construct(
                 chunk_type=ChunkType.COMPLETE,
                 content=None,
-                message_id=str(uuid.uuid4()),
+                message_id=f"{chunk_id_base}-{next_chunk_index()}",
                 session_id=request.session_id,
             )
 
+            await self.touch(request.session_id)
+
             self.logger.info(
                 "Streaming response completed successfully with SessionManager",
                 category="query_execution",
@@ -417,7 +668,8 @@ class ClaudeService:
 
         except Exception as e:
             self.logger.error(
-                f"Streaming failed: {e}",
+                "Streaming failed: %s",
+                e,
                 category="query_execution",
                 session_id=request.session_id,
                 user_id=request.user_id,
@@ -426,22 +678,22 @@ class ClaudeService:
             )
 
             # Yield error chunk
-            yield StreamingChunk(
+            yield StreamingChunk.model_construct(
                 chunk_type=ChunkType.ERROR,
                 content=f"Streaming error: {str(e)}",
-                message_id=str(uuid.uuid4()),
+                message_id=f"{chunk_id_base}-{next_chunk_index()}",
                 session_id=request.session_id,
             )
 
-    async def get_session(
+    def _get_owned_session_metadata(
         self, session_id: str, user_id: str
-    ) -> Optional[SessionResponse]:
-        """Get session details from persistent storage."""
+    ) -> Optional[Dict[str, Any]]:
+        """Return a session's storage metadata if it exists and belongs to the user."""
 
-        try:
-            # Get session from persistent storage
-            session_metadata = self.session_storage.get_session(session_id)
-            if not session_metadata:
+        # Storage reports its own I/O failures and returns None
+        session_metadata = self.session_storage.get_session(session_id)
+        if not session_metadata:
+            if self.logger.isEnabledFor(logging.DEBUG):
                 self.logger.debug(
                     "Session not found in storage",
                     category="session_management",
@@ -449,56 +701,45 @@ class ClaudeService:
                     user_id=user_id,
                     operation="get_session",
                 )
-                return None
-
-            # Verify user access
-            if session_metadata.get("user_id") != user_id:
-                self.logger.warning(
-                    "Session access denied - user mismatch",
-                    category="session_management",
-                    session_id=session_id,
-                    user_id=user_id,
-                    session_user_id=session_metadata.get("user_id"),
-                    operation="get_session",
-                )
-                return None
+            return None
 
-            self.logger.debug(
-                "Session found and validated",
+        # Verify user access
+        if session_metadata.get("user_id") != user_id:
+            self.logger.warning(
+                "Session access denied - user mismatch",
                 category="session_management",
                 session_id=session_id,
                 user_id=user_id,
+                session_user_id=session_metadata.get("user_id"),
                 operation="get_session",
             )
+            return None
 
-            # Convert metadata to SessionResponse
-            from datetime import datetime
-
-            session_response = SessionResponse(
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "Session found and validated",
+                category="session_management",
                 session_id=session_id,
                 user_id=user_id,
-                session_name=session_metadata.get(
-                    "session_name", f"Session {session_id[:8]}"
-                ),
-                status=SessionStatus.ACTIVE,
-                messages=[],  # Messages are handled by Claude SDK
-                created_at=datetime.fromisoformat(session_metadata.get("created_at")),
-                updated_at=datetime.fromisoformat(
-                    session_metadata.get(
-                        "updated_at", session_metadata.get("created_at")
-                    )
-                ),
-                message_count=0,  # Will be populated from Claude SDK if needed
-                context={
-                    "working_directory": session_metadata.get("working_directory")
-                },
+                operation="get_session",
             )
+        return session_metadata
 
-            return session_response
+    async def get_session(
+        self, session_id: str, user_id: str
+    ) -> Optional[SessionResponse]:
+        """Get session details from persistent storage."""
+        session_metadata = self._get_owned_session_metadata(session_id, user_id)
+        if session_metadata is None:
+            return None
 
-        except Exception as e:
+        # Convert metadata to SessionResponse
+        try:
+            return self._session_response_from_metadata(session_metadata)
+        except (KeyError, TypeError, ValueError) as e:
             self.logger.error(
-                f"Session lookup failed: {e}",
+                "Malformed session metadata: %s",
+                e,
                 category="session_management",
                 session_id=session_id,
                 user_id=user_id,
@@ -512,71 +753,193 @@ class ClaudeService:
     ) -> List[SessionResponse]:
         """List user sessions from persistent storage."""
 
-        try:
-            # Get sessions from persistent storage
-            session_metadata_list = self.session_storage.list_user_sessions(
-                user_id, limit, offset
-            )
+        # Get sessions from persistent storage
+        session_metadata_list = self.session_storage.list_user_sessions(
+            user_id, limit, offset
+        )
 
-            # Convert to SessionResponse objects
-            session_responses = []
-            for session_metadata in session_metadata_list:
-                try:
-                    from datetime import datetime
-
-                    session_response = SessionResponse(
-                        session_id=session_metadata.get("session_id"),
-                        user_id=session_metadata.get("user_id"),
-                        session_name=session_metadata.get(
-                            "session_name",
-                            f"Session {session_metadata.get('session_id', '')[:8]}",
-                        ),
-                        status=SessionStatus.ACTIVE,
-                        messages=[],  # Messages are handled by Claude SDK
-                        created_at=datetime.fromisoformat(
-                            session_metadata.get("created_at")
-                        ),
-                        updated_at=datetime.fromisoformat(
-                            session_metadata.get(
-                                "updated_at", session_metadata.get("created_at")
-                            )
-                        ),
-                        message_count=0,  # Will be populated from Claude SDK if needed
-                        context={
-                            "working_directory": session_metadata.get(
-                                "working_directory"
-                            )
-                        },
-                    )
-                    session_responses.append(session_response)
-                except Exception as e:
-                    self.logger.warning(
-                        f"Failed to convert session metadata to response: {e}",
-                        category="session_management",
-                        session_id=session_metadata.get("session_id"),
-                        operation="list_user_sessions",
-                    )
+        # Convert to SessionResponse objects, skipping malformed records
+        session_responses = []
+        for session_metadata in session_metadata_list:
+            try:
+                session_responses.append(
+                    self._session_response_from_metadata(session_metadata)
+                )
+            except (KeyError, TypeError, ValueError) as e:
+                self.logger.warning(
+                    "Failed to convert session metadata to response: %s",
+                    e,
+                    category="session_management",
+                    session_id=session_metadata.get("session_id"),
+                    operation="list_user_sessions",
+                )
 
-            self.logger.debug(
-                f"Found {len(session_metadata_list)} sessions for user, returning {len(session_responses)}",
+        self.logger.debug(
+            "Found %d sessions for user, returning %d",
+            len(session_metadata_list),
+            len(session_responses),
+            category="session_management",
+            user_id=user_id,
+            total_sessions=len(session_metadata_list),
+            returned_sessions=len(session_responses),
+            operation="list_user_sessions",
+        )
+
+        return session_responses
+
+    async def warm_recent_sessions(
+        self, since_seconds: int = 600, max_concurrency: int = 8
+    ) -> int:
+        """
+        Pre-connect SessionManager clients for recently active sessions.
+
+        Called at startup so the first query to a recently used session does not
+        pay the Claude SDK connection handshake.
+
+        Args:
+            since_seconds: Warm sessions updated within this many seconds
+            max_concurrency: Maximum number of clients connecting at once
+
+        Returns:
+            int: Number of sessions warmed successfully
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=since_seconds)
+        recent_sessions = self.session_storage.list_recent_sessions(cutoff)
+        if not recent_sessions:
+            return 0
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def warm(session_metadata: Dict[str, Any]) -> bool:
+            async with semaphore:
+                return await self._warm_client(session_metadata)
+
+        results = await asyncio.gather(*(warm(m) for m in recent_sessions))
+        warmed = sum(results)
+
+        self.logger.info(
+            "Recent session clients warmed",
+            category="session_management",
+            operation="warm_recent_sessions",
+            candidate_sessions=len(recent_sessions),
+            warmed_sessions=warmed,
+        )
+
+        return warmed
+
+    async def warm_session(self, session_id: str) -> bool:
+        """
+        Pre-connect the SessionManager client for one stored session.
+
+        Requested by a client when it opens a session, so the connection
+        handshake overlaps with the user typing instead of delaying the first
+        query. Nothing is connected when the manager is already at its client
+        limit, since that would evict another session's client.
+
+        Args:
+            session_id: Session to warm
+
+        Returns:
+            bool: True if a live client is available for the session
+        """
+        session_manager = self.session_manager
+        if session_manager.is_session_active(session_id):
+            return True
+        if len(session_manager.active_sessions) >= session_manager.max_sessions:
+            return False
+
+        session_metadata = self.session_storage.get_session(session_id)
+        if not session_metadata:
+            return False
+
+        return await self._warm_client(session_metadata)
+
+    async def _warm_client(self, session_metadata: Dict[str, Any]) -> bool:
+        """Connect a persistent client for a stored session, logging failures."""
+        try:
+            await self.session_manager.get_or_create_session(
+                session_id=session_metadata["session_id"],
+                working_dir=session_metadata["working_directory"],
+                user_id=session_metadata["user_id"],
+                is_new_session=False,
+                system_prompt=session_metadata.get("system_prompt"),
+            )
+            return True
+        except Exception as e:
+            self.logger.warning(
+                "Session warmup failed: %s",
+                e,
                 category="session_management",
-                user_id=user_id,
-                total_sessions=len(session_metadata_list),
-                returned_sessions=len(session_responses),
-                operation="list_user_sessions",
+                session_id=session_metadata.get("session_id"),
+                operation="warm_session_failed",
+                error=str(e),
             )
+            return False
 
-            return session_responses
+    async def touch(self, session_id: str) -> None:
+        """
+        Mark a session as recently used so startup warmup picks it up.
 
-        except Exception as e:
+        The update is queued and written by the storage's periodic flush rather
+        than rewriting the storage file at the end of every query.
+        """
+        self.session_storage.queue_touch(session_id)
+
+    async def list_user_sessions_raw(
+        self, user_id: str, limit: int = 10, offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        List user sessions as JSON-ready dicts.
+
+        Skips SessionResponse construction and export entirely, for endpoints that
+        serialize the result straight to JSON.
+        """
+        sessions = []
+        for session_metadata in self.session_storage.list_user_sessions(
+            user_id, limit, offset
+        ):
+            try:
+                sessions.append(self._session_meta_to_dict(session_metadata))
+            except (KeyError, TypeError) as e:
+                self.logger.warning(
+                    "Skipping malformed session metadata: %s",
+                    e,
+                    category="session_management",
+                    session_id=session_metadata.get("session_id"),
+                    operation="list_user_sessions_raw",
+                )
+        return sessions
+
+    async def get_session_raw(
+        self, session_id: str, user_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get session details as a JSON-ready dict.
+
+        Same lookup and access check as get_session(), without building a
+        SessionResponse, for endpoints that serialize the result straight to JSON.
+        """
+        session_metadata = self._get_owned_session_metadata(session_id, user_id)
+        if session_metadata is None:
+            return None
+
+        try:
+            return self._session_meta_to_dict(session_metadata)
+        except (KeyError, TypeError) as e:
             self.logger.error(
-                f"Session listing failed: {e}",
+                "Malformed session metadata: %s",
+                e,
                 category="session_management",
+                session_id=session_id,
                 user_id=user_id,
-                operation="list_user_sessions",
+                operation="get_session_raw",
                 error=str(e),
             )
-            return []
+            return None
+
+    async def count_user_sessions(self, user_id: str) -> int:
+        """Count a user's stored sessions, for pagination totals."""
+        return self.session_storage.count_user_sessions(user_id)
 
     async def delete_session(self, session_id: str, user_id: str) -> bool:
         """Delete a session from persistent storage and SessionManager."""
@@ -603,8 +966,10 @@ class ClaudeService:
                     operation="delete_from_session_manager",
                 )
 
-            # Remove from persistent storage
-            self.session_storage.remove_session(session_id)
+            # Remove from persistent storage, off the event loop like other writes
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.session_storage.remove_session, session_id
+            )
 
             self.logger.info(
                 "Session deleted successfully",
@@ -617,7 +982,8 @@ class ClaudeService:
 
         except Exception as e:
             self.logger.error(
-                f"Failed to delete session: {e}",
+                "Failed to delete session: %s",
+                e,
                 category="session_management",
                 session_id=session_id,
                 user_id=user_id,
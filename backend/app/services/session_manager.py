@@ -6,8 +6,12 @@ eliminating session creation overhead and maintaining context across queries.
 """
 
 import asyncio
+import heapq
+import logging
 import time
-from typing import Dict, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 from claude_code_sdk import ClaudeSDKClient
@@ -15,6 +19,35 @@ from claude_code_sdk.types import ClaudeCodeOptions
 
 from app.utils.logging import StructuredLogger
 
+# Distinct (working_dir, system_prompt) pairs kept in the options cache
+_OPTIONS_CACHE_SIZE = 128
+
+# Mobile sessions run unattended, so tool use is never gated on a prompt
+_PERMISSION_MODE = "bypassPermissions"
+
+# Shortest sleep between cleanup passes, so a session whose check was just
+# rescheduled at the current time does not spin the loop
+_MIN_CLEANUP_DELAY = 0.01
+
+
+@dataclass(slots=True)
+class SessionRecord:
+    """
+    Bookkeeping for one persistent ClaudeSDKClient.
+
+    last_used and created_at are time.monotonic() values, so idle expiry is
+    unaffected by wall-clock adjustments.
+    """
+
+    client: ClaudeSDKClient
+    working_dir: str
+    user_id: str
+    last_used: float
+    created_at: float
+    claude_session_id: str
+    is_connected: bool = True
+    options: Optional[ClaudeCodeOptions] = None
+
 
 class SessionManager:
     """
@@ -26,30 +59,46 @@ class SessionManager:
     - Session validation and recovery for disconnected clients
     - Configurable timeout and cleanup intervals
     - Proper async lifecycle management
+
+    All state is owned by the event loop and only touched from coroutines, so
+    plain dict operations need no locking; the per-session asyncio locks only
+    guard sequences that span an await (client creation and query turns).
     """
 
-    def __init__(self, session_timeout: int = 3600, cleanup_interval: int = 300):
+    def __init__(
+        self,
+        session_timeout: int = 3600,
+        cleanup_interval: int = 300,
+        max_sessions: int = 1000,
+        max_turns_per_user: int = 4,
+    ):
         """
         Initialize SessionManager with configurable timeouts.
 
         Args:
             session_timeout: Session inactivity timeout in seconds (default: 1 hour)
             cleanup_interval: Cleanup task interval in seconds (default: 5 minutes)
+            max_sessions: Maximum live clients; the least recently used one is
+                evicted when a new client would exceed it (default: 1000)
+            max_turns_per_user: Maximum query turns one user can run at once
+                across all of their sessions (default: 4)
         """
-        self.active_sessions: Dict[str, Dict] = {}
-        # Structure: {
-        #   "session_id": {
-        #       "client": ClaudeSDKClient,
-        #       "working_dir": str,
-        #       "last_used": float,
-        #       "created_at": float,
-        #       "user_id": str,
-        #       "is_connected": bool
-        #   }
-        # }
+        # Ordered least to most recently used, so eviction takes from the front
+        self.active_sessions: "OrderedDict[str, SessionRecord]" = OrderedDict()
+        self._creation_locks: Dict[str, asyncio.Lock] = {}
+        self._turn_locks: Dict[str, asyncio.Lock] = {}
+        self._user_turn_slots: Dict[str, asyncio.Semaphore] = {}
+        # (expires_at, session_id) min-heap for idle cleanup, plus the expiry each
+        # session is currently scheduled at; other heap entries for it are stale
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._scheduled_expiry: Dict[str, float] = {}
+        self._options_cache: Dict[Tuple[str, Optional[str]], ClaudeCodeOptions] = {}
         self.cleanup_task = None
         self.session_timeout = session_timeout
         self.cleanup_interval = cleanup_interval
+        self.max_sessions = max_sessions
+        self.max_turns_per_user = max_turns_per_user
+        self.evicted_sessions = 0
         self.logger = StructuredLogger(__name__)
 
         self.logger.info(
@@ -58,6 +107,8 @@ class SessionManager:
             operation="init",
             session_timeout=session_timeout,
             cleanup_interval=cleanup_interval,
+            max_sessions=max_sessions,
+            max_turns_per_user=max_turns_per_user,
         )
 
     async def get_or_create_session(
@@ -66,6 +117,7 @@ class SessionManager:
         working_dir: str,
         user_id: str,
         is_new_session: bool = False,
+        system_prompt: Optional[str] = None,
     ) -> ClaudeSDKClient:
         """
         Get existing persistent session client or create new one.
@@ -75,6 +127,7 @@ class SessionManager:
             working_dir: Working directory for session storage
             user_id: User identifier for session ownership
             is_new_session: Whether this is a new session creation
+            system_prompt: Optional stable instructions appended to the system prompt
 
         Returns:
             ClaudeSDKClient: Persistent client instance
@@ -83,21 +136,25 @@ class SessionManager:
             RuntimeError: If client creation or connection fails
         """
 
+        options = None
+
         # Check if session exists and client is still valid
-        if session_id in self.active_sessions:
-            session_info = self.active_sessions[session_id]
-            client = session_info["client"]
+        session_info = self.active_sessions.get(session_id)
+        if session_info is not None:
+            client = session_info.client
 
             # Validate client is still connected
-            if await self._validate_client(client):
-                session_info["last_used"] = time.time()
-                self.logger.debug(
-                    "Reusing existing session client",
-                    category="session_manager",
-                    operation="get_session",
-                    session_id=session_id,
-                    user_id=user_id,
-                )
+            if self._validate_client(client):
+                self._mark_used(session_id, session_info)
+                # Runs on every query; skip building the log fields unless emitted
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(
+                        "Reusing existing session client",
+                        category="session_manager",
+                        operation="get_session",
+                        session_id=session_id,
+                        user_id=user_id,
+                    )
                 return client
             else:
                 self.logger.warning(
@@ -106,38 +163,57 @@ class SessionManager:
                     operation="client_validation_failed",
                     session_id=session_id,
                 )
-                # Client disconnected, clean up and recreate
+                # Client disconnected, clean up and recreate with the same options
+                options = session_info.options
                 await self.cleanup_session(session_id)
 
-        # Create new persistent client
-        try:
-            self.logger.info(
-                "Creating new session client",
-                category="session_manager",
-                operation="create_session",
-                session_id=session_id,
-                user_id=user_id,
-                working_dir=working_dir,
-                is_new_session=is_new_session,
-            )
-
-            # Configure Claude SDK options for persistent session
-            # IMPORTANT: Don't use resume parameter - let Claude SDK manage its own sessions
-            # The resume parameter was causing crashes when sessions didn't exist in Claude's storage
-            options = ClaudeCodeOptions(
-                cwd=working_dir,
-                permission_mode="bypassPermissions",
-                # resume parameter removed - was causing "No conversation found" errors
-            )
+        # Serialize creation per session so concurrent requests for the same
+        # session share one CLI subprocess instead of each spawning their own
+        requested_session_id = session_id
+        lock = self._creation_locks.setdefault(session_id, asyncio.Lock())
+        async with lock:
+            # Another request may have created the client while we waited
+            session_info = self.active_sessions.get(session_id)
+            if session_info is not None and self._validate_client(session_info.client):
+                self._mark_used(session_id, session_info)
+                return session_info.client
+
+            # Keep the number of live CLI subprocesses bounded between cleanup passes
+            while len(self.active_sessions) >= self.max_sessions:
+                await self._evict_least_recently_used()
+
+            # Create new persistent client
+            try:
+                self.logger.info(
+                    "Creating new session client",
+                    category="session_manager",
+                    operation="create_session",
+                    session_id=session_id,
+                    user_id=user_id,
+                    working_dir=working_dir,
+                    is_new_session=is_new_session,
+                )
 
-            client = ClaudeSDKClient(options)
-            await client.connect()
+                # Configure Claude SDK options for persistent session
+                # IMPORTANT: Don't use resume parameter - let Claude SDK manage its own sessions
+                # The resume parameter was causing crashes when sessions didn't exist in Claude's storage
+                # The system prompt is fixed for the client's lifetime so the CLI can serve it
+                # from Anthropic's prompt cache instead of re-billing it every turn
+                if options is None:
+                    options = self._get_options(working_dir, system_prompt)
 
-            # Get the actual session ID from the Claude SDK client
-            # The SDK generates its own session IDs that we need to use
-            actual_session_id = session_id
-            if hasattr(client, 'session_id') and client.session_id:
-                actual_session_id = client.session_id
+                client = ClaudeSDKClient(options)
+                try:
+                    await client.connect()
+                except BaseException:
+                    # connect() may have spawned the CLI subprocess before failing;
+                    # shut it down here since no record will ever own this client
+                    await self._disconnect_quietly(client, session_id)
+                    raise
+
+                # Get the actual session ID from the Claude SDK client
+                # The SDK generates its own session IDs that we need to use
+                actual_session_id = getattr(client, "session_id", None) or session_id
                 if actual_session_id != session_id:
                     self.logger.info(
                         "Using Claude SDK generated session ID",
@@ -148,52 +224,210 @@ class SessionManager:
                     )
                     session_id = actual_session_id
 
-            # Store session info with the actual Claude SDK session ID
-            self.active_sessions[session_id] = {
-                "client": client,
-                "working_dir": working_dir,
-                "user_id": user_id,
-                "last_used": time.time(),
-                "created_at": time.time(),
-                "is_connected": True,
-                "claude_session_id": session_id,  # Store the actual Claude SDK session ID
-            }
-
-            # Start cleanup task if not running
-            if self.cleanup_task is None or self.cleanup_task.done():
-                self.cleanup_task = asyncio.create_task(self._cleanup_loop())
+                # Store session info with the actual Claude SDK session ID
+                now = time.monotonic()
+                self.active_sessions[session_id] = SessionRecord(
+                    client=client,
+                    working_dir=working_dir,
+                    user_id=user_id,
+                    last_used=now,
+                    created_at=now,
+                    claude_session_id=session_id,  # Store the actual Claude SDK session ID
+                    options=options,
+                )
+                self._schedule_expiry(session_id, now + self.session_timeout)
+                if session_id != requested_session_id:
+                    # The record lives under the SDK's ID; the temporary key is done
+                    self._creation_locks.pop(requested_session_id, None)
+
+                # Start cleanup task if not running
+                if self.cleanup_task is None or self.cleanup_task.done():
+                    self.cleanup_task = asyncio.create_task(self._cleanup_loop())
+                    self.logger.info(
+                        "Started session cleanup task",
+                        category="session_manager",
+                        operation="start_cleanup_task",
+                    )
+
                 self.logger.info(
-                    "Started session cleanup task",
+                    "Session client created successfully",
                     category="session_manager",
-                    operation="start_cleanup_task",
+                    operation="session_created",
+                    session_id=session_id,
+                    user_id=user_id,
+                    active_sessions_count=len(self.active_sessions),
                 )
 
-            self.logger.info(
-                "Session client created successfully",
-                category="session_manager",
-                operation="session_created",
-                session_id=session_id,
-                user_id=user_id,
-                active_sessions_count=len(self.active_sessions),
+                return client
+
+            except Exception as e:
+                self.logger.error(
+                    "Failed to create session client: %s",
+                    e,
+                    category="session_manager",
+                    operation="create_session_failed",
+                    session_id=session_id,
+                    user_id=user_id,
+                    error=str(e),
+                )
+                raise RuntimeError(f"Failed to create session {session_id}: {e}")
+
+    def _mark_used(self, session_id: str, session_info: SessionRecord) -> None:
+        """Refresh a session's last use and move it to the back of the LRU order."""
+        session_info.last_used = time.monotonic()
+        self.active_sessions.move_to_end(session_id)
+
+    def turn_lock(self, session_id: str) -> asyncio.Lock:
+        """
+        Get the lock serializing query/response turns on a session's client.
+
+        A persistent client carries one conversation; two overlapping queries
+        would interleave their responses on the same stream.
+
+        Args:
+            session_id: Session ID the turn runs against
+
+        Returns:
+            asyncio.Lock: Lock to hold from client.query() until the response ends
+        """
+        return self._turn_locks.setdefault(session_id, asyncio.Lock())
+
+    def user_turn_slots(self, user_id: str) -> asyncio.Semaphore:
+        """
+        Get the semaphore bounding a user's concurrent query turns.
+
+        Turns on one session are already serialized by turn_lock(); this caps
+        how many sessions a single user can drive at once, so one client
+        fanning out queries cannot monopolize the event loop or the provider's
+        rate limit.
+
+        Args:
+            user_id: User the turn runs for
+
+        Returns:
+            asyncio.Semaphore: Semaphore to hold for the duration of the turn
+        """
+        slots = self._user_turn_slots.get(user_id)
+        if slots is None:
+            slots = self._user_turn_slots[user_id] = asyncio.Semaphore(
+                self.max_turns_per_user
             )
+        return slots
 
-            return client
+    def _get_options(
+        self, working_dir: str, system_prompt: Optional[str]
+    ) -> ClaudeCodeOptions:
+        """
+        Return the shared client options for a working directory and prompt.
 
-        except Exception as e:
-            self.logger.error(
-                f"Failed to create session client: {e}",
-                category="session_manager",
-                operation="create_session_failed",
-                session_id=session_id,
-                user_id=user_id,
-                error=str(e),
+        Options are never mutated after construction, so clients created for the
+        same project and system prompt share one instance.
+
+        Args:
+            working_dir: Working directory for the session
+            system_prompt: Optional stable instructions appended to the system prompt
+
+        Returns:
+            ClaudeCodeOptions: Cached options for the pair
+        """
+        key = (working_dir, system_prompt)
+        options = self._options_cache.get(key)
+        if options is None:
+            if len(self._options_cache) >= _OPTIONS_CACHE_SIZE:
+                self._options_cache.clear()
+            options = self._options_cache[key] = ClaudeCodeOptions(
+                cwd=working_dir,
+                permission_mode=_PERMISSION_MODE,
+                append_system_prompt=system_prompt,
+                # resume parameter removed - was causing "No conversation found" errors
             )
-            raise RuntimeError(f"Failed to create session {session_id}: {e}")
+        return options
+
+    def _release_user_turn_slots(self, user_id: Optional[str]) -> None:
+        """
+        Forget a user's turn semaphore once it is idle and they have no live sessions.
+
+        User IDs come from clients, so entries are dropped as their last session
+        goes away instead of accumulating for the lifetime of the process.
+
+        Args:
+            user_id: Owner of a session that was just unregistered
+        """
+        slots = self._user_turn_slots.get(user_id)
+        # asyncio.Semaphore has no public count; a full value means no turn holds it
+        if slots is None or slots._value < self.max_turns_per_user:
+            return
+        if any(record.user_id == user_id for record in self.active_sessions.values()):
+            return
+        del self._user_turn_slots[user_id]
+
+    def _schedule_expiry(self, session_id: str, expires_at: float) -> None:
+        """
+        Schedule an idle check for a session in the expiry heap.
+
+        A session has at most one live heap entry. Using it only bumps
+        last_used, so the entry may come due early; the cleanup loop then
+        reschedules it at the real expiry instead of removing the session.
+
+        Args:
+            session_id: Session to check
+            expires_at: time.monotonic() value at which the session may have gone idle
+        """
+        if session_id in self._scheduled_expiry:
+            return
+        self._scheduled_expiry[session_id] = expires_at
+        heapq.heappush(self._expiry_heap, (expires_at, session_id))
+
+    def _pop_due_sessions(self, now: float) -> List[str]:
+        """
+        Pop the sessions whose scheduled idle check is due.
+
+        Args:
+            now: Current time.monotonic() value
 
-    async def _validate_client(self, client: ClaudeSDKClient) -> bool:
+        Returns:
+            List[str]: Session IDs to check, without stale heap entries
+        """
+        due = []
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, session_id = heapq.heappop(heap)
+            if self._scheduled_expiry.get(session_id) == expires_at:
+                del self._scheduled_expiry[session_id]
+                due.append(session_id)
+        return due
+
+    def _next_cleanup_delay(self, now: float) -> float:
+        """
+        Seconds until the cleanup loop should next run.
+
+        The loop sleeps until the earliest scheduled idle check, capped at
+        cleanup_interval so checks scheduled while it sleeps are never held
+        back for longer than one interval.
+
+        Args:
+            now: Current time.monotonic() value
+
+        Returns:
+            float: Delay before the next cleanup pass
+        """
+        if not self._expiry_heap:
+            return self.cleanup_interval
+        delay = min(self._expiry_heap[0][0] - now, self.cleanup_interval)
+        return max(delay, _MIN_CLEANUP_DELAY)
+
+    def _is_busy(self, session_id: str) -> bool:
+        """Whether a query/response turn is currently running on the session."""
+        lock = self._turn_locks.get(session_id)
+        return lock is not None and lock.locked()
+
+    def _validate_client(self, client: ClaudeSDKClient) -> bool:
         """
         Validate that ClaudeSDKClient is still connected and functional.
 
+        This is a plain attribute check with no I/O, so it runs synchronously
+        instead of allocating a coroutine on every session reuse.
+
         Args:
             client: ClaudeSDKClient instance to validate
 
@@ -205,18 +439,16 @@ class SessionManager:
             if not client:
                 return False
 
-            # Check if the client has the connection attribute
+            # Check the client's connection attribute
             # Don't check _session as it may not exist or be in different state
-            if hasattr(client, 'is_connected'):
-                return client.is_connected
-
             # If we can't determine connection state, assume it's valid
             # to avoid unnecessary reconnections
-            return True
+            return getattr(client, "is_connected", True)
 
         except Exception as e:
             self.logger.debug(
-                f"Client validation check: {e}",
+                "Client validation check: %s",
+                e,
                 category="session_manager",
                 operation="validate_client",
                 error=str(e),
@@ -234,7 +466,11 @@ class SessionManager:
         Returns:
             bool: True if cleanup successful, False if session not found
         """
-        if session_id not in self.active_sessions:
+        # Unregister before disconnecting, so requests arriving while disconnect()
+        # runs create a fresh client instead of picking up the dying one, and a
+        # concurrent cleanup of the same session finds nothing to do
+        session_info = self.active_sessions.pop(session_id, None)
+        if session_info is None:
             self.logger.debug(
                 "Session not found for cleanup",
                 category="session_manager",
@@ -243,16 +479,21 @@ class SessionManager:
             )
             return False
 
-        session_info = self.active_sessions[session_id]
-        client = session_info["client"]
-        user_id = session_info.get("user_id", "unknown")
+        self._creation_locks.pop(session_id, None)
+        self._turn_locks.pop(session_id, None)
+        self._release_user_turn_slots(session_info.user_id)
+        client = session_info.client
+        user_id = session_info.user_id or "unknown"
 
         try:
             # Only try to disconnect if client exists and has disconnect method
-            if client and hasattr(client, 'disconnect'):
+            disconnect = getattr(client, "disconnect", None) if client else None
+            if disconnect is not None:
                 try:
-                    # Use a timeout to prevent hanging
-                    await asyncio.wait_for(client.disconnect(), timeout=5.0)
+                    # Use a timeout to prevent hanging, and shield the disconnect so
+                    # cancelling the caller (e.g. during shutdown) cannot tear it
+                    # down halfway and leak the CLI subprocess
+                    await asyncio.shield(asyncio.wait_for(disconnect(), timeout=5.0))
                     self.logger.info(
                         "Session client disconnected",
                         category="session_manager",
@@ -271,7 +512,8 @@ class SessionManager:
             # Don't log "cancel scope" errors - they're expected during cleanup
             if "cancel scope" not in str(e).lower():
                 self.logger.warning(
-                    f"Error disconnecting client during cleanup: {e}",
+                    "Error disconnecting client during cleanup: %s",
+                    e,
                     category="session_manager",
                     operation="cleanup_disconnect_error",
                     session_id=session_id,
@@ -279,8 +521,6 @@ class SessionManager:
                 )
             # Continue cleanup even if disconnect fails
 
-        del self.active_sessions[session_id]
-
         self.logger.info(
             "Session cleaned up successfully",
             category="session_manager",
@@ -292,12 +532,109 @@ class SessionManager:
 
         return True
 
+    def _reschedule_if_active(self, session_id: str, now: float) -> bool:
+        """
+        Reschedule a session's idle check if it is busy or was used recently.
+
+        Args:
+            session_id: Session to check
+            now: Current time.monotonic() value
+
+        Returns:
+            bool: True if the session is still in use and was rescheduled
+        """
+        expires_at = self.active_sessions[session_id].last_used + self.session_timeout
+        if self._is_busy(session_id):
+            # Check again once the running turn has had time to end
+            self._schedule_expiry(session_id, max(expires_at, now + self.cleanup_interval))
+            return True
+        if expires_at >= now:
+            self._schedule_expiry(session_id, expires_at)
+            return True
+        return False
+
+    async def _expire_session(self, session_id: str) -> bool:
+        """
+        Cleanup a session selected as idle, unless it was picked up since.
+
+        gather() yields to the event loop before this runs, so a request may
+        have reused the client or started a turn after the session was
+        selected; the check is repeated here, right before the record is popped.
+
+        Args:
+            session_id: Session selected for cleanup
+
+        Returns:
+            bool: True if the session was cleaned up
+        """
+        if session_id not in self.active_sessions:
+            return False
+        if self._reschedule_if_active(session_id, time.monotonic()):
+            return False
+        return await self.cleanup_session(session_id)
+
+    async def _cleanup_sessions(self, session_ids: List[str], only_idle: bool = False) -> None:
+        """
+        Cleanup several sessions, disconnecting their clients concurrently.
+
+        Args:
+            session_ids: Session IDs to cleanup
+            only_idle: Skip sessions that are busy or were used again since selection
+        """
+        cleanup = self._expire_session if only_idle else self.cleanup_session
+        results = await asyncio.gather(
+            *(cleanup(session_id) for session_id in session_ids),
+            return_exceptions=True,
+        )
+        for session_id, result in zip(session_ids, results):
+            if isinstance(result, Exception):
+                self.logger.warning(
+                    "Error cleaning up session: %s",
+                    result,
+                    category="session_manager",
+                    operation="cleanup_sessions_error",
+                    session_id=session_id,
+                )
+
+    async def _disconnect_quietly(self, client: ClaudeSDKClient, session_id: str) -> None:
+        """Best-effort disconnect of a client that never made it into the registry."""
+        try:
+            await asyncio.wait_for(client.disconnect(), timeout=5.0)
+        except Exception as e:
+            self.logger.warning(
+                "Error disconnecting client after failed connect: %s",
+                e,
+                category="session_manager",
+                operation="connect_failed_disconnect",
+                session_id=session_id,
+            )
+
+    async def _evict_least_recently_used(self):
+        """Disconnect and drop the session that has been idle the longest."""
+        # Prefer sessions with no turn in flight; only if every client is busy
+        # does the oldest one get cut off. The front of active_sessions is the
+        # least recently used, so the scan normally stops at the first entry.
+        session_id = next(
+            (sid for sid in self.active_sessions if not self._is_busy(sid)),
+            next(iter(self.active_sessions)),
+        )
+        self.logger.info(
+            "Evicting least recently used session",
+            category="session_manager",
+            operation="evict_session",
+            session_id=session_id,
+            max_sessions=self.max_sessions,
+        )
+        await self.cleanup_session(session_id)
+        self.evicted_sessions += 1
+
     async def _cleanup_loop(self):
         """
-        Periodically cleanup inactive sessions to prevent resource leaks.
+        Cleanup inactive sessions to prevent resource leaks.
 
-        Runs continuously until cancelled, checking for inactive sessions
-        based on the configured timeout and cleanup interval.
+        Runs continuously until cancelled, waking when the earliest scheduled
+        idle check comes due (at least every cleanup_interval) instead of on a
+        fixed tick.
         """
         self.logger.info(
             "Session cleanup loop started",
@@ -307,30 +644,33 @@ class SessionManager:
             cleanup_interval=self.cleanup_interval,
         )
 
-        try:
-            while True:
-                await asyncio.sleep(self.cleanup_interval)
+        while True:
+            try:
+                await asyncio.sleep(self._next_cleanup_delay(time.monotonic()))
 
-                current_time = time.time()
+                current_time = time.monotonic()
                 sessions_to_remove = []
 
-                # Identify inactive sessions
-                for session_id, session_info in self.active_sessions.items():
-                    if current_time - session_info["last_used"] > self.session_timeout:
+                # Only sessions whose scheduled idle check has come due are
+                # looked at; the rest of active_sessions is never walked
+                for session_id in self._pop_due_sessions(current_time):
+                    if session_id not in self.active_sessions:
+                        continue
+                    if not self._reschedule_if_active(session_id, current_time):
                         sessions_to_remove.append(session_id)
 
                 # Cleanup inactive sessions
                 if sessions_to_remove:
                     self.logger.info(
-                        f"Cleaning up {len(sessions_to_remove)} inactive sessions",
+                        "Cleaning up %d inactive sessions",
+                        len(sessions_to_remove),
                         category="session_manager",
                         operation="cleanup_inactive_sessions",
                         inactive_sessions=len(sessions_to_remove),
                         total_sessions=len(self.active_sessions),
                     )
 
-                    for session_id in sessions_to_remove:
-                        await self.cleanup_session(session_id)
+                    await self._cleanup_sessions(sessions_to_remove, only_idle=True)
                 else:
                     self.logger.debug(
                         "No inactive sessions to cleanup",
@@ -339,21 +679,22 @@ class SessionManager:
                         active_sessions=len(self.active_sessions),
                     )
 
-        except asyncio.CancelledError:
-            self.logger.info(
-                "Session cleanup loop cancelled",
-                category="session_manager",
-                operation="cleanup_loop_cancelled",
-            )
-            raise
-        except Exception as e:
-            self.logger.error(
-                f"Cleanup loop error: {e}",
-                category="session_manager",
-                operation="cleanup_loop_error",
-                error=str(e),
-            )
-            # Continue running despite errors
+            except asyncio.CancelledError:
+                self.logger.info(
+                    "Session cleanup loop cancelled",
+                    category="session_manager",
+                    operation="cleanup_loop_cancelled",
+                )
+                raise
+            except Exception as e:
+                self.logger.error(
+                    "Cleanup loop error: %s",
+                    e,
+                    category="session_manager",
+                    operation="cleanup_loop_error",
+                    error=str(e),
+                )
+                # Continue running despite errors
 
     async def get_session_stats(self) -> Dict:
         """
@@ -362,42 +703,46 @@ class SessionManager:
         Returns:
             Dict: Statistics about active sessions and manager state
         """
-        current_time = time.time()
+        current_time = time.monotonic()
 
         stats = {
             "active_sessions": len(self.active_sessions),
             "session_timeout_seconds": self.session_timeout,
             "cleanup_interval_seconds": self.cleanup_interval,
+            "max_sessions": self.max_sessions,
+            "evicted_sessions": self.evicted_sessions,
             "cleanup_task_running": (
                 self.cleanup_task is not None and not self.cleanup_task.done()
             ),
             "timestamp": datetime.utcnow().isoformat(),
         }
 
-        # Add session age statistics
+        # Add session age and per-user statistics in a single pass
         if self.active_sessions:
-            session_ages = [
-                current_time - session_info["created_at"]
-                for session_info in self.active_sessions.values()
-            ]
+            oldest_age = 0.0
+            newest_age = float("inf")
+            total_age = 0.0
+            user_counts = {}
+            for session_info in self.active_sessions.values():
+                age = current_time - session_info.created_at
+                if age > oldest_age:
+                    oldest_age = age
+                if age < newest_age:
+                    newest_age = age
+                total_age += age
+                user_id = session_info.user_id or "unknown"
+                user_counts[user_id] = user_counts.get(user_id, 0) + 1
 
             stats.update(
                 {
-                    "oldest_session_age_seconds": max(session_ages),
-                    "newest_session_age_seconds": min(session_ages),
-                    "average_session_age_seconds": sum(session_ages)
-                    / len(session_ages),
+                    "oldest_session_age_seconds": oldest_age,
+                    "newest_session_age_seconds": newest_age,
+                    "average_session_age_seconds": total_age
+                    / len(self.active_sessions),
+                    "sessions_by_user": user_counts,
                 }
             )
 
-            # Count sessions by user
-            user_counts = {}
-            for session_info in self.active_sessions.values():
-                user_id = session_info.get("user_id", "unknown")
-                user_counts[user_id] = user_counts.get(user_id, 0) + 1
-
-            stats["sessions_by_user"] = user_counts
-
         return stats
 
     async def shutdown(self):
@@ -426,10 +771,13 @@ class SessionManager:
                 operation="cleanup_task_cancelled",
             )
 
-        # Cleanup all active sessions
+        # Cleanup all active sessions; the turn semaphores go first so each
+        # cleanup skips looking for the user's remaining sessions
+        self._user_turn_slots.clear()
         session_ids = list(self.active_sessions.keys())
-        for session_id in session_ids:
-            await self.cleanup_session(session_id)
+        await self._cleanup_sessions(session_ids)
+        self._expiry_heap.clear()
+        self._scheduled_expiry.clear()
 
         self.logger.info(
             "SessionManager shutdown completed",
@@ -470,4 +818,4 @@ class SessionManager:
             Optional[str]: User ID if session exists, None otherwise
         """
         session_info = self.active_sessions.get(session_id)
-        return session_info.get("user_id") if session_info else None
+        return session_info.user_id if session_info else None
@@ -8,7 +8,8 @@ for debugging session management and Claude SDK interactions.
 import logging
 import sys
 from typing import Dict, Any, Optional
-from pythonjsonlogger import jsonlogger
+
+import orjson
 
 from app.core.config import get_settings
 
@@ -32,6 +33,36 @@ class ContextualFilter(logging.Filter):
         return True
 
 
+# Attributes every LogRecord carries; anything else on a record came from extra=
+_RECORD_ATTRS = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__
+) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as one JSON object per line using orjson."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "asctime": self.formatTime(record, self.datefmt),
+            "name": record.name,
+            "levelname": record.levelname,
+            "category": getattr(record, "category", None),
+            "message": record.getMessage(),
+            "session_id": getattr(record, "session_id", None),
+            "user_id": getattr(record, "user_id", None),
+            "operation": getattr(record, "operation", None),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and key not in payload:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+
+        # Context values are mostly strings and numbers; str() covers the rest
+        return orjson.dumps(payload, default=str).decode()
+
+
 def setup_logging() -> None:
     """Configure application-wide logging."""
 
@@ -42,10 +73,7 @@ def setup_logging() -> None:
 
     # Create formatter based on configuration
     if settings.log_format.lower() == "json":
-        formatter = jsonlogger.JsonFormatter(
-            fmt="%(asctime)s %(name)s %(levelname)s %(category)s %(message)s %(session_id)s %(user_id)s %(operation)s",
-            datefmt="%Y-%m-%dT%H:%M:%SZ",
-        )
+        formatter = JsonFormatter(datefmt="%Y-%m-%dT%H:%M:%SZ")
     else:
         formatter = logging.Formatter(
             fmt="%(asctime)s [%(levelname)s] %(category)s: %(message)s",
@@ -97,36 +125,64 @@ class StructuredLogger:
         self.logger = get_logger(name)
         self._extra_context: Dict[str, Any] = {}
 
-    def _log(self, level: int, message: str, **kwargs) -> None:
-        """Internal log method with context merging."""
-        extra = {**self._extra_context, **kwargs}
-        self.logger.log(level, message, extra=extra)
-
-    def debug(self, message: str, **context) -> None:
+    def isEnabledFor(self, level: int) -> bool:
+        """Check whether a message at this level would be emitted."""
+        return self.logger.isEnabledFor(level)
+
+    def _log(self, level: int, message: str, *args: Any, **kwargs) -> None:
+        """Internal log method with context merging.
+
+        Positional args are passed through for lazy %-style formatting, so the
+        message is only interpolated when a handler actually emits it. Pass
+        ``exc_info=True`` to attach the current traceback.
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+        exc_info = kwargs.pop("exc_info", None)
+        # kwargs is already a fresh dict; only copy when there is context to merge
+        extra = {**self._extra_context, **kwargs} if self._extra_context else kwargs
+        self.logger.log(level, message, *args, exc_info=exc_info, extra=extra)
+
+    def debug(self, message: str, *args: Any, **context) -> None:
         """Log debug message with context."""
-        self._log(logging.DEBUG, message, **context)
+        self._log(logging.DEBUG, message, *args, **context)
 
-    def info(self, message: str, **context) -> None:
+    def info(self, message: str, *args: Any, **context) -> None:
         """Log info message with context."""
-        self._log(logging.INFO, message, **context)
+        self._log(logging.INFO, message, *args, **context)
 
-    def warning(self, message: str, **context) -> None:
+    def warning(self, message: str, *args: Any, **context) -> None:
         """Log warning message with context."""
-        self._log(logging.WARNING, message, **context)
+        self._log(logging.WARNING, message, *args, **context)
 
-    def error(self, message: str, **context) -> None:
+    def error(self, message: str, *args: Any, **context) -> None:
         """Log error message with context."""
-        self._log(logging.ERROR, message, **context)
+        self._log(logging.ERROR, message, *args, **context)
 
-    def critical(self, message: str, **context) -> None:
+    def critical(self, message: str, *args: Any, **context) -> None:
         """Log critical message with context."""
-        self._log(logging.CRITICAL, message, **context)
+        self._log(logging.CRITICAL, message, *args, **context)
 
     def with_context(self, **context) -> LogContext:
         """Create a context manager for structured logging."""
         return LogContext(self, **context)
 
 
+# Level names accepted by the log_*_event helpers
+_LOG_LEVELS: Dict[str, int] = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+}
+
+
+def _level_number(level: str) -> int:
+    """Resolve a level name, falling back to INFO for unknown names."""
+    return _LOG_LEVELS.get(level) or _LOG_LEVELS.get(level.lower(), logging.INFO)
+
+
 # Convenience functions for common log categories
 def log_session_event(
     logger: StructuredLogger,
@@ -138,8 +194,8 @@ def log_session_event(
     **extra,
 ) -> None:
     """Log a session management event."""
-    method = getattr(logger, level.lower())
-    method(
+    logger._log(
+        _level_number(level),
         message,
         category="session_management",
         session_id=session_id,
@@ -158,8 +214,8 @@ def log_claude_sdk_event(
     **extra,
 ) -> None:
     """Log a Claude SDK interaction event."""
-    method = getattr(logger, level.lower())
-    method(
+    logger._log(
+        _level_number(level),
         message,
         category="claude_sdk",
         session_id=session_id,
@@ -177,8 +233,8 @@ def log_streaming_event(
     **extra,
 ) -> None:
     """Log a streaming event."""
-    method = getattr(logger, level.lower())
-    method(
+    logger._log(
+        _level_number(level),
         message,
         category="streaming",
         session_id=session_id,
@@ -196,8 +252,8 @@ def log_networking_event(
     **extra,
 ) -> None:
     """Log a networking event."""
-    method = getattr(logger, level.lower())
-    method(
+    logger._log(
+        _level_number(level),
         message,
         category="networking",
         endpoint=endpoint,
@@ -215,8 +271,8 @@ def log_performance_event(
     **extra,
 ) -> None:
     """Log a performance measurement."""
-    method = getattr(logger, level.lower())
-    method(
+    logger._log(
+        _level_number(level),
         message,
         category="performance",
         operation=operation,
@@ -3,29 +3,56 @@ Persistent session metadata storage for Claude Code Mobile backend.
 
 Provides file-based storage for session metadata that persists across server restarts,
 enabling proper Claude SDK session resumption by maintaining working directory context.
+
+Sessions live in a JSON snapshot plus an append-only journal of changes next to
+it. Writes append one line to the journal instead of rewriting the snapshot;
+once the journal grows past a threshold it is folded back into the snapshot.
 """
 
-import json
-from datetime import datetime
+import logging
+import mmap
+import time
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from threading import Lock
 
+import orjson
+
 from app.utils.logging import StructuredLogger
 
+# Journal size at which it is folded back into the snapshot file
+_JOURNAL_COMPACT_BYTES = 4 * 1024 * 1024
+
 
 class PersistentSessionStorage:
     """
     File-based session metadata storage that persists across server restarts.
 
     Stores session metadata (working directories, user IDs) in a JSON file
-    to enable proper Claude SDK session resumption.
+    to enable proper Claude SDK session resumption. Changes are appended to a
+    journal file (the storage file with a .wal suffix) as one JSON record per
+    line: {"op": "put", "session_id": ..., "metadata": {...}} or
+    {"op": "del", "session_id": ...}.
     """
 
     def __init__(self, storage_file: Path):
         self.storage_file = storage_file
+        self.journal_file = storage_file.with_suffix(".wal")
         self.logger = StructuredLogger(__name__)
         self._lock = Lock()  # Thread safety for file operations
+        # Parsed snapshot plus replayed journal records, reused until the
+        # snapshot's mtime/size changes
+        self._cache: Optional[Dict[str, Any]] = None
+        self._cache_signature: Optional[Tuple[int, int]] = None
+        # Journal bytes already applied to the cache
+        self._journal_offset = 0
+        # Per-user (created_at, session_id) entries kept sorted, so listings and
+        # counts never scan every stored session and a page is a slice
+        self._sessions_by_user: Dict[str, List[Tuple[str, str]]] = {}
+        # Epoch times of touches waiting for the next flush_touches() call
+        self._pending_touches: Dict[str, float] = {}
 
         # Ensure storage directory exists
         self.storage_file.parent.mkdir(parents=True, exist_ok=True)
@@ -52,7 +79,7 @@ class PersistentSessionStorage:
                     storage_file=str(self.storage_file),
                 )
             else:
-                # Validate existing file
+                # Validate existing file (and build the user index)
                 self._read_storage()
                 self.logger.info(
                     "Loaded existing session storage",
@@ -68,34 +95,198 @@ class PersistentSessionStorage:
                 error=str(e),
             )
             # Create new file if corrupted
+            self._reset_cache()
             self._write_storage({})
 
+    @staticmethod
+    def _index_entry(session_id: str, session_metadata: Dict[str, Any]) -> Tuple[str, str]:
+        """Sort key for a session in the user index."""
+        return session_metadata.get("created_at") or "", session_id
+
+    def _index_session(self, session_id: str, session_metadata: Dict[str, Any]):
+        """Add a session to the user index."""
+        user_id = session_metadata.get("user_id")
+        if user_id:
+            insort(
+                self._sessions_by_user.setdefault(user_id, []),
+                self._index_entry(session_id, session_metadata),
+            )
+
+    def _unindex_session(self, session_id: str, session_metadata: Dict[str, Any]):
+        """Remove a session from the user index."""
+        user_id = session_metadata.get("user_id")
+        user_sessions = self._sessions_by_user.get(user_id)
+        if user_sessions is None:
+            return
+        entry = self._index_entry(session_id, session_metadata)
+        position = bisect_left(user_sessions, entry)
+        if position < len(user_sessions) and user_sessions[position] == entry:
+            del user_sessions[position]
+            if not user_sessions:
+                del self._sessions_by_user[user_id]
+
+    def _reset_cache(self):
+        """Forget the cached contents and the user index built from them."""
+        self._cache = None
+        self._cache_signature = None
+        self._sessions_by_user.clear()
+
+    def _file_signature(self) -> Tuple[int, int]:
+        """Return (mtime_ns, size) of the storage file."""
+        stat = self.storage_file.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def _journal_size(self) -> int:
+        """Return the size of the journal file, 0 if there is none yet."""
+        try:
+            return self.journal_file.stat().st_size
+        except FileNotFoundError:
+            return 0
+
     def _read_storage(self) -> Dict[str, Any]:
-        """Read session data from storage file."""
+        """
+        Read session data from the snapshot file and the journal.
+
+        The parsed snapshot is cached and only re-read when the file's mtime or
+        size changes; journal records appended since the last read, by this or
+        another worker process, are then applied on top. Repeated lookups cost
+        two stat() calls instead of a full JSON parse.
+        """
         try:
-            with open(self.storage_file, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError) as e:
+            signature = self._file_signature()
+            if (
+                self._cache is None
+                or signature != self._cache_signature
+                # A shrunken journal means another worker compacted it
+                or self._journal_size() < self._journal_offset
+            ):
+                self._load_snapshot(self._parse_snapshot(), signature)
+            self._replay_journal()
+            return self._cache
+
+        except (orjson.JSONDecodeError, FileNotFoundError) as e:
             self.logger.warning(
                 f"Failed to read storage file, using empty storage: {e}",
                 category="session_storage",
                 operation="read_storage",
                 error=str(e),
             )
+            # Nothing cached may outlive the file it came from
+            self._reset_cache()
             return {}
 
+    def _parse_snapshot(self) -> Dict[str, Any]:
+        """
+        Parse the snapshot file from a read-only memory map.
+
+        orjson reads the mapped pages directly, so no bytes copy of the whole
+        file is held alongside the parsed dict. Snapshots are only ever
+        replaced by rename, never truncated in place, so the mapping stays valid.
+        """
+        with open(self.storage_file, "rb") as f:
+            if f.seek(0, 2) == 0:
+                # An empty file cannot be mapped; let orjson reject it
+                return orjson.loads(b"")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    return orjson.loads(view)
+
+    def _load_snapshot(self, data: Dict[str, Any], signature: Tuple[int, int]):
+        """Replace the cache with snapshot contents and rebuild the user index."""
+        self._cache = data
+        self._cache_signature = signature
+        self._journal_offset = 0
+        self._sessions_by_user.clear()
+        for session_id, session_metadata in data.items():
+            user_id = session_metadata.get("user_id")
+            if user_id:
+                self._sessions_by_user.setdefault(user_id, []).append(
+                    self._index_entry(session_id, session_metadata)
+                )
+        for user_sessions in self._sessions_by_user.values():
+            user_sessions.sort()
+
+    def _replay_journal(self):
+        """Apply journal records appended since the last read to the cache."""
+        size = self._journal_size()
+        if size <= self._journal_offset:
+            return
+
+        with open(self.journal_file, "rb") as f:
+            f.seek(self._journal_offset)
+            pending = f.read(size - self._journal_offset)
+
+        # A record another worker is still appending has no newline yet
+        complete = pending.rfind(b"\n") + 1
+        for line in pending[:complete].splitlines():
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError as e:
+                self.logger.warning(
+                    "Skipping unreadable journal record: %s",
+                    e,
+                    category="session_storage",
+                    operation="replay_journal",
+                )
+                continue
+            session_id = record["session_id"]
+            previous = self._cache.pop(session_id, None)
+            if previous:
+                self._unindex_session(session_id, previous)
+            if record["op"] == "put":
+                self._cache[session_id] = record["metadata"]
+                self._index_session(session_id, record["metadata"])
+        self._journal_offset += complete
+
+    def _append_journal(self, records: List[Dict[str, Any]]):
+        """
+        Persist changes by appending them to the journal.
+
+        The records are applied to the cache by replaying the journal, which
+        also picks up anything other workers appended since the last read.
+        Callers hold self._lock and have just called _read_storage().
+        """
+        if self._cache is None:
+            # The snapshot could not be read; start a fresh one for the journal
+            # to apply to
+            self._write_storage({})
+
+        payload = b"".join(
+            orjson.dumps(record, default=str) + b"\n" for record in records
+        )
+        with open(self.journal_file, "ab") as f:
+            f.write(payload)
+
+        self._replay_journal()
+        if self._journal_offset >= _JOURNAL_COMPACT_BYTES:
+            self._write_storage(self._cache)
+
     def _write_storage(self, data: Dict[str, Any]):
-        """Write session data to storage file."""
+        """
+        Write a full snapshot of session data and empty the journal.
+
+        Only used to create the file and to compact the journal. A record
+        another worker appends between the snapshot rename and the truncate is
+        lost, the same window the whole-file rewrites always had.
+        """
         try:
             # Write to temporary file first, then atomic rename
             temp_file = self.storage_file.with_suffix(".tmp")
-            with open(temp_file, "w") as f:
-                json.dump(data, f, indent=2, default=str)
+            with open(temp_file, "wb") as f:
+                f.write(orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2))
 
             # Atomic rename
             temp_file.replace(self.storage_file)
 
+            # The snapshot now holds everything the journal recorded
+            with open(self.journal_file, "wb"):
+                pass
+
+            self._load_snapshot(data, self._file_signature())
+
         except Exception as e:
+            # Drop the cache so the next read goes back to what is on disk
+            self._reset_cache()
             self.logger.error(
                 f"Failed to write storage file: {e}",
                 category="session_storage",
@@ -111,6 +302,7 @@ class PersistentSessionStorage:
         working_directory: str,
         session_name: str = None,
         created_at: datetime = None,
+        system_prompt: Optional[str] = None,
     ) -> bool:
         """
         Store session metadata persistently.
@@ -121,25 +313,31 @@ class PersistentSessionStorage:
             working_directory: Working directory for the session
             session_name: Optional session name
             created_at: Session creation timestamp
+            system_prompt: Optional system prompt the session client was created with
 
         Returns:
             bool: True if successful, False otherwise
         """
         try:
             with self._lock:
-                data = self._read_storage()
+                # Catch up with other workers' journal records; this is a stat()
+                # unless the snapshot changed, not a parse
+                self._read_storage()
+                now = datetime.utcnow().isoformat()
 
                 session_metadata = {
                     "session_id": session_id,
                     "user_id": user_id,
                     "working_directory": working_directory,
                     "session_name": session_name or f"Session {session_id[:8]}",
-                    "created_at": (created_at or datetime.utcnow()).isoformat(),
-                    "updated_at": datetime.utcnow().isoformat(),
+                    "created_at": created_at.isoformat() if created_at else now,
+                    "updated_at": now,
+                    "system_prompt": system_prompt,
                 }
 
-                data[session_id] = session_metadata
-                self._write_storage(data)
+                self._append_journal(
+                    [{"op": "put", "session_id": session_id, "metadata": session_metadata}]
+                )
 
                 self.logger.info(
                     "Session metadata stored",
@@ -171,29 +369,25 @@ class PersistentSessionStorage:
             session_id: Claude SDK session ID
 
         Returns:
-            Dict containing session metadata or None if not found
+            Dict containing session metadata or None if not found. The dict is
+            a copy, so callers may modify it without touching the cache.
         """
         try:
             with self._lock:
                 data = self._read_storage()
                 session_metadata = data.get(session_id)
 
-                if session_metadata:
+                if self.logger.isEnabledFor(logging.DEBUG):
                     self.logger.debug(
-                        "Session metadata retrieved",
-                        category="session_storage",
-                        operation="get_session",
-                        session_id=session_id,
-                    )
-                else:
-                    self.logger.debug(
-                        "Session metadata not found",
+                        "Session metadata retrieved"
+                        if session_metadata
+                        else "Session metadata not found",
                         category="session_storage",
                         operation="get_session",
                         session_id=session_id,
                     )
 
-                return session_metadata
+                return dict(session_metadata) if session_metadata else None
 
         except Exception as e:
             self.logger.error(
@@ -217,32 +411,32 @@ class PersistentSessionStorage:
             offset: Pagination offset
 
         Returns:
-            List of session metadata dictionaries
+            List of session metadata dictionaries, copied from the cache
         """
         try:
             with self._lock:
                 data = self._read_storage()
 
-                # Filter sessions by user_id
-                user_sessions = []
-                for session_id, session_metadata in data.items():
-                    if session_metadata.get("user_id") == user_id:
-                        user_sessions.append(session_metadata)
-
-                # Sort by creation time (newest first)
-                user_sessions.sort(key=lambda s: s.get("created_at", ""), reverse=True)
+                # The index is sorted oldest first, so the newest-first page is a
+                # slice off its tail; the user's other sessions are never touched
+                user_sessions = self._sessions_by_user.get(user_id, [])
+                end = len(user_sessions) - offset
+                page = user_sessions[max(end - limit, 0):max(end, 0)]
+                paginated_sessions = [
+                    dict(data[session_id]) for _, session_id in reversed(page)
+                ]
 
-                # Apply pagination
-                paginated_sessions = user_sessions[offset : offset + limit]
-
-                self.logger.debug(
-                    f"Found {len(user_sessions)} sessions for user, returning {len(paginated_sessions)}",
-                    category="session_storage",
-                    operation="list_user_sessions",
-                    user_id=user_id,
-                    total_sessions=len(user_sessions),
-                    returned_sessions=len(paginated_sessions),
-                )
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(
+                        "Found %d sessions for user, returning %d",
+                        len(user_sessions),
+                        len(paginated_sessions),
+                        category="session_storage",
+                        operation="list_user_sessions",
+                        user_id=user_id,
+                        total_sessions=len(user_sessions),
+                        returned_sessions=len(paginated_sessions),
+                    )
 
                 return paginated_sessions
 
@@ -256,6 +450,129 @@ class PersistentSessionStorage:
             )
             return []
 
+    def count_user_sessions(self, user_id: str) -> int:
+        """
+        Count sessions for a specific user without loading them.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            int: Number of stored sessions owned by the user
+        """
+        try:
+            with self._lock:
+                # Revalidates the cache so the index reflects other workers' writes
+                self._read_storage()
+                return len(self._sessions_by_user.get(user_id, ()))
+
+        except Exception as e:
+            self.logger.error(
+                f"Failed to count user sessions: {e}",
+                category="session_storage",
+                operation="count_user_sessions",
+                user_id=user_id,
+                error=str(e),
+            )
+            return 0
+
+    def list_recent_sessions(self, since: datetime) -> list:
+        """
+        List sessions updated at or after a given time.
+
+        Args:
+            since: Only sessions whose updated_at is not older than this are returned
+
+        Returns:
+            List of session metadata dictionaries, copied from the cache
+        """
+        try:
+            with self._lock:
+                data = self._read_storage()
+
+                # ISO-8601 strings of the same format compare chronologically
+                cutoff = since.isoformat()
+                return [
+                    dict(session_metadata)
+                    for session_metadata in data.values()
+                    if session_metadata.get(
+                        "updated_at", session_metadata.get("created_at", "")
+                    )
+                    >= cutoff
+                ]
+
+        except Exception as e:
+            self.logger.error(
+                f"Failed to list recent sessions: {e}",
+                category="session_storage",
+                operation="list_recent_sessions",
+                error=str(e),
+            )
+            return []
+
+    def queue_touch(self, session_id: str) -> None:
+        """
+        Record that a session was used, to be persisted by flush_touches().
+
+        Keeps the file rewrite off the request path; repeated touches of the
+        same session between flushes collapse into one update.
+
+        Args:
+            session_id: Claude SDK session ID
+        """
+        with self._lock:
+            # A bare float here; the datetime is only built when flushed
+            self._pending_touches[session_id] = time.time()
+
+    def flush_touches(self) -> int:
+        """
+        Persist all queued touches with a single storage write.
+
+        Returns:
+            int: Number of sessions whose updated_at was refreshed
+        """
+        with self._lock:
+            if not self._pending_touches:
+                return 0
+            pending, self._pending_touches = self._pending_touches, {}
+
+            try:
+                data = self._read_storage()
+                records = []
+                for session_id, touched_at in pending.items():
+                    session_metadata = data.get(session_id)
+                    if session_metadata:
+                        records.append(
+                            {
+                                "op": "put",
+                                "session_id": session_id,
+                                "metadata": dict(
+                                    session_metadata,
+                                    updated_at=datetime.utcfromtimestamp(
+                                        touched_at
+                                    ).isoformat(),
+                                ),
+                            }
+                        )
+
+                if records:
+                    self._append_journal(records)
+                return len(records)
+
+            except Exception as e:
+                # Queue the touches again so the next flush retries them,
+                # keeping the newer timestamp if a session was touched twice
+                for session_id, touched_at in pending.items():
+                    if touched_at > self._pending_touches.get(session_id, 0.0):
+                        self._pending_touches[session_id] = touched_at
+                self.logger.error(
+                    f"Failed to flush session touches: {e}",
+                    category="session_storage",
+                    operation="flush_touches",
+                    error=str(e),
+                )
+                return 0
+
     def remove_session(self, session_id: str) -> bool:
         """
         Remove session metadata.
@@ -271,8 +588,7 @@ class PersistentSessionStorage:
                 data = self._read_storage()
 
                 if session_id in data:
-                    del data[session_id]
-                    self._write_storage(data)
+                    self._append_journal([{"op": "del", "session_id": session_id}])
 
                     self.logger.info(
                         "Session metadata removed",
@@ -304,33 +620,29 @@ class PersistentSessionStorage:
             int: Number of sessions cleaned up
         """
         try:
-            from datetime import timedelta
-
-            cutoff_date = datetime.utcnow() - timedelta(days=max_age_days)
+            # created_at is written by datetime.isoformat(), and ISO-8601 strings
+            # of the same format compare chronologically, so nothing is parsed
+            cutoff = (datetime.utcnow() - timedelta(days=max_age_days)).isoformat()
 
             with self._lock:
                 data = self._read_storage()
                 sessions_to_remove = []
 
                 for session_id, session_metadata in data.items():
-                    created_at_str = session_metadata.get("created_at")
-                    if created_at_str:
-                        try:
-                            created_at = datetime.fromisoformat(
-                                created_at_str.replace("Z", "+00:00")
-                            )
-                            if created_at < cutoff_date:
-                                sessions_to_remove.append(session_id)
-                        except (ValueError, TypeError):
-                            # Invalid date format, consider for removal
+                    created_at = session_metadata.get("created_at")
+                    if created_at:
+                        # Anything but a string is an invalid date; remove it
+                        if not isinstance(created_at, str) or created_at < cutoff:
                             sessions_to_remove.append(session_id)
 
                 # Remove old sessions
-                for session_id in sessions_to_remove:
-                    del data[session_id]
-
                 if sessions_to_remove:
-                    self._write_storage(data)
+                    self._append_journal(
+                        [
+                            {"op": "del", "session_id": session_id}
+                            for session_id in sessions_to_remove
+                        ]
+                    )
 
                 self.logger.info(
                     f"Cleaned up {len(sessions_to_remove)} old sessions",
@@ -369,16 +681,11 @@ class PersistentSessionStorage:
                     "file_size_bytes": self.storage_file.stat().st_size
                     if self.storage_file.exists()
                     else 0,
+                    "journal_size_bytes": self._journal_size(),
                 }
 
-                # User count
-                users = set()
-                for session_metadata in data.values():
-                    user_id = session_metadata.get("user_id")
-                    if user_id:
-                        users.add(user_id)
-
-                stats["unique_users"] = len(users)
+                # Users with at least one session; empty index entries are dropped
+                stats["unique_users"] = len(self._sessions_by_user)
 
                 return stats
 
@@ -401,18 +401,19 @@ async def validate_session_client(client: ClaudeSDKClient) -> Dict[str, Any]:
 
     try:
         # Check if client has required attributes
-        if not hasattr(client, "_session"):
+        sentinel = object()
+        session = getattr(client, "_session", sentinel)
+        if session is sentinel:
             validation_result["error"] = "Client missing _session attribute"
             return validation_result
 
-        validation_result["has_session"] = client._session is not None
+        validation_result["has_session"] = session is not None
 
         # Check if session ID is available
-        if hasattr(client, "session_id"):
-            validation_result["session_id"] = client.session_id
+        validation_result["session_id"] = getattr(client, "session_id", None)
 
         # Check connection status
-        validation_result["is_connected"] = client._session is not None
+        validation_result["is_connected"] = session is not None
 
         # Overall validation
         validation_result["is_valid"] = (
@@ -576,22 +577,22 @@ def get_combined_session_stats(session_manager, session_storage) -> Dict[str, An
         storage_stats = session_storage.get_storage_stats()
 
         # Calculate session health metrics
-        current_time = time.time()
+        current_time = time.monotonic()
         session_ages = []
         active_sessions_detail = []
 
         for session_id, session_info in session_manager.active_sessions.items():
-            age = current_time - session_info["created_at"]
-            last_used_ago = current_time - session_info["last_used"]
+            age = current_time - session_info.created_at
+            last_used_ago = current_time - session_info.last_used
 
             session_ages.append(age)
             active_sessions_detail.append(
                 {
                     "session_id": session_id[:8] + "...",  # Truncated for privacy
-                    "user_id": session_info.get("user_id", "unknown"),
+                    "user_id": session_info.user_id or "unknown",
                     "age_seconds": age,
                     "last_used_ago_seconds": last_used_ago,
-                    "working_dir": session_info.get("working_dir", "unknown"),
+                    "working_dir": session_info.working_dir or "unknown",
                 }
             )
 
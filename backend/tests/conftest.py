@@ -5,6 +5,7 @@ Provides test fixtures for FastAPI testing, temporary directories,
 and Claude SDK mocking for reliable test execution.
 """
 
+import asyncio
 import pytest
 import tempfile
 import os
@@ -32,6 +33,7 @@ sys.modules['claude_code_sdk.types'] = claude_types_mock
 from app.main import app
 from app.services.claude_service import ClaudeService
 from app.core.lifecycle import initialize_claude_environment
+from app.utils.session_storage import PersistentSessionStorage
 
 
 @pytest.fixture
@@ -155,6 +157,114 @@ def mock_session_file(temp_project_root):
         session_file.unlink()
 
 
+# Stand-ins for SDK message types. stream_response dispatches on the block's
+# class name, so these keep the SDK's names.
+class TextBlock:
+    def __init__(self, text):
+        self.text = text
+
+
+class ToolUseBlock:
+    def __init__(self, name, input=None, id="tool-1"):
+        self.name = name
+        self.input = input or {}
+        self.id = id
+
+
+class SDKMessage:
+    def __init__(self, *blocks):
+        self.content = list(blocks)
+
+
+class FakeSDK:
+    """
+    Scripted replacement for ClaudeSDKClient.
+
+    ``respond`` maps a prompt to the items its response yields: SDKMessage
+    objects, or numbers to sleep for that many seconds between them. By
+    default each prompt is echoed back as a single text message. Every query
+    and response is recorded in ``events``.
+    """
+
+    TextBlock = TextBlock
+    ToolUseBlock = ToolUseBlock
+    Message = SDKMessage
+
+    def __init__(self):
+        self.respond = lambda prompt: [SDKMessage(TextBlock(prompt))]
+        self.events = []
+        self.clients = []
+
+    def create_client(self, options):
+        client = FakeSDKClient(self, options)
+        self.clients.append(client)
+        return client
+
+
+class FakeSDKClient:
+    """Persistent client handed out by FakeSDK."""
+
+    # None lets SessionManager keep the requested session ID
+    session_id = None
+    is_connected = True
+
+    def __init__(self, sdk, options):
+        self.sdk = sdk
+        self.options = options
+        self.prompt = None
+
+    async def connect(self):
+        pass
+
+    async def disconnect(self):
+        pass
+
+    async def query(self, prompt):
+        self.sdk.events.append(("query", prompt))
+        self.prompt = prompt
+
+    async def receive_response(self):
+        for item in self.sdk.respond(self.prompt):
+            if isinstance(item, (int, float)):
+                await asyncio.sleep(item)
+            else:
+                yield item
+        self.sdk.events.append(("response", self.prompt))
+
+
+@pytest.fixture
+def fake_sdk(monkeypatch):
+    """Make SessionManager create scripted FakeSDK clients."""
+    sdk = FakeSDK()
+    monkeypatch.setattr(
+        "app.services.session_manager.ClaudeSDKClient", sdk.create_client
+    )
+    return sdk
+
+
+@pytest.fixture
+def session_storage(tmp_path):
+    """Session storage backed by a file in the test's tmp_path."""
+    return PersistentSessionStorage(tmp_path / "sessions.json")
+
+
+@pytest.fixture(autouse=True)
+def isolated_project_root(tmp_path, monkeypatch):
+    """
+    Point the app lifespan at a temporary project root.
+
+    Without this, every TestClient startup writes .claude_sessions.json into
+    the repository root.
+    """
+    monkeypatch.setenv("CLAUDE_PROJECT_ROOT", str(tmp_path))
+    original_cwd = os.getcwd()
+
+    yield tmp_path
+
+    # The lifespan chdirs into the project root; leave before tmp_path goes away
+    os.chdir(original_cwd)
+
+
 @pytest.fixture(autouse=True)
 def cleanup_temp_files():
     """Automatically cleanup temporary files after each test."""
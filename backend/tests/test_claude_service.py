@@ -0,0 +1,295 @@
+"""
+ClaudeService query and streaming tests.
+
+Tests response streaming, SSE framing and query concurrency
+against the scripted SDK client from conftest.
+"""
+
+import pytest
+import asyncio
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sse_starlette.sse import ServerSentEvent
+
+from app.main import app
+from app.services.session_manager import SessionManager
+from app.services.claude_service import ClaudeService
+from app.models.requests import ClaudeQueryRequest
+from app.models.responses import ChunkType, StreamingChunk
+
+
+class TestClaudeServiceStreaming:
+    """Test how SDK messages are turned into streamed chunks."""
+
+    @pytest.fixture
+    def session_manager(self):
+        """SessionManager for a single test."""
+        return SessionManager()
+
+    @pytest.fixture
+    def claude_service(self, tmp_path, session_storage, session_manager):
+        """ClaudeService with one stored session for "stream-user"."""
+        session_storage.store_session(
+            session_id="stream-session",
+            user_id="stream-user",
+            working_directory=str(tmp_path),
+        )
+        return ClaudeService(tmp_path, session_storage, session_manager)
+
+    async def _stream(self, claude_service):
+        """Collect the chunks between the start and completion chunks."""
+        query = ClaudeQueryRequest(
+            session_id="stream-session", user_id="stream-user", query="Hi"
+        )
+        chunks = [chunk async for chunk in claude_service.stream_response(query, None)]
+        return chunks[1:-1]
+
+    @pytest.mark.asyncio
+    async def test_stream_coalesces_text_blocks(self, fake_sdk, claude_service, session_manager):
+        """Test that adjacent text blocks of one SDK message stream as a single delta."""
+        # Arrange
+        fake_sdk.respond = lambda prompt: [
+            fake_sdk.Message(
+                fake_sdk.TextBlock("Hello"),
+                fake_sdk.TextBlock(", "),
+                fake_sdk.ToolUseBlock("Read"),
+                fake_sdk.TextBlock("world"),
+            )
+        ]
+
+        # Act
+        chunks = await self._stream(claude_service)
+
+        # Assert
+        assert [(c.chunk_type, c.content) for c in chunks] == [
+            ("delta", "Hello, "),
+            ("tool", "🔧 Using Read"),
+            ("delta", "world"),
+        ]
+
+        # Cleanup
+        await session_manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_stream_sends_message_text_before_sdk_pause(
+        self, fake_sdk, claude_service, session_manager
+    ):
+        """Test that text is yielded when its message ends, not held until the next one."""
+        # Arrange
+        fake_sdk.respond = lambda prompt: [
+            fake_sdk.Message(fake_sdk.TextBlock("Sure.")),
+            fake_sdk.Message(fake_sdk.TextBlock("I will write the file.")),
+            0.5,
+            fake_sdk.Message(fake_sdk.ToolUseBlock("Write")),
+        ]
+        query = ClaudeQueryRequest(
+            session_id="stream-session", user_id="stream-user", query="Hi"
+        )
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        # Act
+        arrivals = [
+            (chunk.chunk_type, chunk.content, loop.time() - started)
+            async for chunk in claude_service.stream_response(query, None)
+        ][1:-1]
+
+        # Assert
+        assert [(kind, content) for kind, content, _ in arrivals] == [
+            ("delta", "Sure."),
+            ("delta", "I will write the file."),
+            ("tool", "🔧 Using Write"),
+        ]
+        assert arrivals[1][2] < 0.25
+        assert arrivals[2][2] >= 0.5
+
+        # Cleanup
+        await session_manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_stream_forwards_chunks_without_throttle(
+        self, fake_sdk, claude_service, session_manager
+    ):
+        """Test that chunks are forwarded as they arrive, each with a distinct ID."""
+        # Arrange
+        words = ["This ", "is ", "a ", "streaming ", "response."]
+        fake_sdk.respond = lambda prompt: [
+            fake_sdk.Message(fake_sdk.TextBlock(word)) for word in words
+        ]
+        query = ClaudeQueryRequest(
+            session_id="stream-session", user_id="stream-user", query="Hi"
+        )
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        # Act
+        chunks = [chunk async for chunk in claude_service.stream_response(query, None)]
+        elapsed = loop.time() - started
+
+        # Assert
+        assert [c.content for c in chunks if c.chunk_type == ChunkType.DELTA] == words
+        # No fixed per-chunk sleep: a 10 ms throttle alone would take 50 ms
+        assert elapsed < 0.01 * len(words)
+        assert len({c.message_id for c in chunks}) == len(chunks)
+
+        # Cleanup
+        await session_manager.shutdown()
+
+    def test_chunk_sse_frame_matches_sse_starlette(self):
+        """Test that a pre-encoded chunk frame is byte-identical to sse_starlette's."""
+        # Arrange
+        chunk = StreamingChunk.model_construct(
+            chunk_type=ChunkType.DELTA,
+            content="line one\nline two",
+            message_id="frame-1",
+            session_id="frame-session",
+            timestamp=datetime(2025, 1, 1, 12, 0, 0),
+        )
+
+        # Act
+        frame = chunk.to_sse()
+
+        # Assert
+        expected = ServerSentEvent(
+            event=chunk.chunk_type.value, data=chunk.to_bytes().decode()
+        ).encode()
+        assert frame == expected
+
+
+class TestClaudeServiceConcurrency:
+    """Test how concurrent queries share persistent clients."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_queries_take_turns(self, fake_sdk, session_storage, tmp_path):
+        """Test that overlapping queries on one session run one turn at a time."""
+        # Arrange
+        fake_sdk.respond = lambda prompt: [0.01, fake_sdk.Message(fake_sdk.TextBlock(prompt))]
+        session_storage.store_session(
+            session_id="turn-session",
+            user_id="turn-user",
+            working_directory=str(tmp_path),
+        )
+        session_manager = SessionManager()
+        claude_service = ClaudeService(tmp_path, session_storage, session_manager)
+
+        # Act
+        responses = await asyncio.gather(*(
+            claude_service.query(
+                ClaudeQueryRequest(session_id="turn-session", user_id="turn-user", query=prompt),
+                None,
+            )
+            for prompt in ("first", "second")
+        ))
+
+        # Assert
+        assert [r.message.content for r in responses] == ["first", "second"]
+        assert fake_sdk.events == [
+            ("query", "first"), ("response", "first"),
+            ("query", "second"), ("response", "second"),
+        ]
+
+        # Cleanup
+        await session_manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_warm_session_connects_once(self, fake_sdk, session_storage, tmp_path):
+        """Test that warming a session connects its client only once."""
+        # Arrange
+        session_storage.store_session(
+            session_id="open-session",
+            user_id="open-user",
+            working_directory=str(tmp_path),
+        )
+        session_manager = SessionManager()
+        claude_service = ClaudeService(tmp_path, session_storage, session_manager)
+
+        # Act
+        first = await claude_service.warm_session("open-session")
+        second = await claude_service.warm_session("open-session")
+        missing = await claude_service.warm_session("missing-session")
+
+        # Assert
+        assert first and second
+        assert not missing
+        assert len(fake_sdk.clients) == 1
+
+        # Cleanup
+        await session_manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_warm_session_skipped_at_capacity(self, fake_sdk, session_storage, tmp_path):
+        """Test that warming never evicts another session's client."""
+        # Arrange
+        for session_id in ("busy-session", "cold-session"):
+            session_storage.store_session(
+                session_id=session_id,
+                user_id="warm-user",
+                working_directory=str(tmp_path),
+            )
+        session_manager = SessionManager(max_sessions=1)
+        claude_service = ClaudeService(tmp_path, session_storage, session_manager)
+        await claude_service.warm_session("busy-session")
+
+        # Act
+        warmed = await claude_service.warm_session("cold-session")
+
+        # Assert
+        assert not warmed
+        assert session_manager.get_active_session_ids() == ["busy-session"]
+
+        # Cleanup
+        await session_manager.shutdown()
+
+
+class TestWarmSessionEndpoint:
+    """Test POST /claude/sessions/{session_id}/warm."""
+
+    @pytest.fixture
+    def client(self, fake_sdk, tmp_path):
+        """TestClient with one stored session owned by "warm-user"."""
+        with TestClient(app) as client:
+            app.state.session_storage.store_session(
+                session_id="warm-session",
+                user_id="warm-user",
+                working_directory=str(tmp_path),
+            )
+            yield client
+
+    def test_warm_owned_session(self, client, fake_sdk):
+        """Test that the owner gets the session's client connected."""
+        # Act
+        response = client.post(
+            "/claude/sessions/warm-session/warm", params={"user_id": "warm-user"}
+        )
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == {"session_id": "warm-session", "warmed": True}
+        assert len(fake_sdk.clients) == 1
+
+    def test_warm_session_of_other_user(self, client, fake_sdk):
+        """Test that another user's session is reported as not found."""
+        # Act
+        response = client.post(
+            "/claude/sessions/warm-session/warm", params={"user_id": "other-user"}
+        )
+
+        # Assert
+        assert response.status_code == 404
+        assert fake_sdk.clients == []
+
+    def test_warm_session_at_capacity(self, client, fake_sdk):
+        """Test that nothing is connected when the live client limit is reached."""
+        # Arrange
+        app.state.session_manager.max_sessions = 0
+
+        # Act
+        response = client.post(
+            "/claude/sessions/warm-session/warm", params={"user_id": "warm-user"}
+        )
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == {"session_id": "warm-session", "warmed": False}
+        assert fake_sdk.clients == []
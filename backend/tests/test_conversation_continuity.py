@@ -504,7 +504,7 @@ class TestConversationContinuity:
 
     @pytest.mark.asyncio
     async def test_mobile_streaming_optimization(self, temp_app_setup, mock_conversation_client):
-        """Test that mobile streaming optimization is preserved."""
+        """Test that streamed chunks are forwarded without artificial delays."""
         # Arrange
         session_manager = temp_app_setup["session_manager"]
         session_storage = temp_app_setup["session_storage"]
@@ -574,11 +574,4 @@ class TestConversationContinuity:
 
             # Verify we got multiple chunks
             delta_chunks = [c for c in chunks if c.chunk_type == ChunkType.DELTA]
-            assert len(delta_chunks) >= 5  # Multiple content chunks
-
-            # Verify mobile optimization delays (should be at least 0.01s between chunks)
-            if len(chunk_times) > 2:
-                # Time between chunks should show delays
-                time_diffs = [chunk_times[i+1] - chunk_times[i] for i in range(len(chunk_times)-1)]
-                # Should have some measurable delays (accounting for test timing variance)
-                assert any(diff >= 0.005 for diff in time_diffs)  # At least 5ms delays
\ No newline at end of file
+            assert len(delta_chunks) >= 5  # Multiple content chunks
\ No newline at end of file
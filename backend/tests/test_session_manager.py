@@ -11,7 +11,7 @@ import time
 from unittest.mock import AsyncMock, MagicMock, patch
 from pathlib import Path
 
-from app.services.session_manager import SessionManager
+from app.services.session_manager import SessionManager, SessionRecord
 from app.utils.session_utils import validate_session_client
 
 
@@ -66,10 +66,10 @@ class TestSessionManager:
             actual_session_id = "mock-session-123"  # This is what the client returns
             assert actual_session_id in self.session_manager.active_sessions
             session_info = self.session_manager.active_sessions[actual_session_id]
-            assert session_info["client"] == mock_client
-            assert session_info["working_dir"] == "/test/dir"
-            assert session_info["user_id"] == "test-user"
-            assert session_info["is_connected"] is True
+            assert session_info.client == mock_client
+            assert session_info.working_dir == "/test/dir"
+            assert session_info.user_id == "test-user"
+            assert session_info.is_connected is True
 
             # Verify ClaudeSDKClient was created and connected
             MockClient.assert_called_once()
@@ -107,7 +107,7 @@ class TestSessionManager:
             assert MockClient.call_count == 1
             # Last used time should be updated
             session_info = self.session_manager.active_sessions["existing-session"]
-            assert session_info["last_used"] > session_info["created_at"]
+            assert session_info.last_used > session_info.created_at
 
     @pytest.mark.asyncio
     async def test_client_validation_failure_recreates_session(self):
@@ -125,14 +125,15 @@ class TestSessionManager:
             MockClient.side_effect = [invalid_client, valid_client]
 
             # Create initial session with invalid client
-            self.session_manager.active_sessions["test-session"] = {
-                "client": invalid_client,
-                "working_dir": "/test/dir",
-                "user_id": "test-user",
-                "last_used": time.time(),
-                "created_at": time.time(),
-                "is_connected": False
-            }
+            self.session_manager.active_sessions["test-session"] = SessionRecord(
+                client=invalid_client,
+                working_dir="/test/dir",
+                user_id="test-user",
+                last_used=time.monotonic(),
+                created_at=time.monotonic(),
+                claude_session_id="test-session",
+                is_connected=False
+            )
 
             # Act - Try to get session (should recreate due to invalid client)
             client = await self.session_manager.get_or_create_session(
@@ -147,6 +148,138 @@ class TestSessionManager:
             assert MockClient.call_count == 1  # One new client created
             valid_client.connect.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_client(self):
+        """Test that concurrent requests for one session create a single client."""
+        # Arrange
+        with patch('app.services.session_manager.ClaudeSDKClient') as MockClient:
+            mock_client = AsyncMock(session_id="shared-session", is_connected=True)
+            mock_client.connect.side_effect = lambda: asyncio.sleep(0.01)
+            MockClient.return_value = mock_client
+
+            # Act
+            clients = await asyncio.gather(*(
+                self.session_manager.get_or_create_session(
+                    session_id="shared-session",
+                    working_dir="/test/dir",
+                    user_id="test-user",
+                )
+                for _ in range(3)
+            ))
+
+            # Assert
+            assert all(client is mock_client for client in clients)
+            assert MockClient.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_reconnect_reuses_session_options(self):
+        """Test that a recreated client keeps the options of the session it replaces."""
+        # Arrange
+        with patch('app.services.session_manager.ClaudeSDKClient') as MockClient:
+            first_client = AsyncMock(session_id="reconnect-session", is_connected=False)
+            second_client = AsyncMock(session_id="reconnect-session", is_connected=True)
+            MockClient.side_effect = [first_client, second_client]
+
+            await self.session_manager.get_or_create_session(
+                session_id="reconnect-session",
+                working_dir="/test/dir",
+                user_id="test-user",
+                is_new_session=True,
+                system_prompt="Stay concise",
+            )
+
+            # Act - first client reports disconnected, so it gets recreated
+            client = await self.session_manager.get_or_create_session(
+                session_id="reconnect-session",
+                working_dir="/test/dir",
+                user_id="test-user",
+            )
+
+            # Assert
+            assert client == second_client
+            first_options = MockClient.call_args_list[0][0][0]
+            second_options = MockClient.call_args_list[1][0][0]
+            assert second_options is first_options
+
+    @pytest.mark.asyncio
+    async def test_sessions_share_cached_options(self):
+        """Test that sessions with the same project and prompt share one options object."""
+        # Arrange
+        with patch('app.services.session_manager.ClaudeSDKClient') as MockClient:
+            MockClient.side_effect = [
+                AsyncMock(session_id="options-a"),
+                AsyncMock(session_id="options-b"),
+                AsyncMock(session_id="options-c"),
+            ]
+
+            # Act
+            for session_id, prompt in (
+                ("options-a", "Stay concise"),
+                ("options-b", "Stay concise"),
+                ("options-c", None),
+            ):
+                await self.session_manager.get_or_create_session(
+                    session_id=session_id,
+                    working_dir="/test/dir",
+                    user_id="test-user",
+                    is_new_session=True,
+                    system_prompt=prompt,
+                )
+
+            # Assert
+            options = [call[0][0] for call in MockClient.call_args_list]
+            assert options[0] is options[1]
+            assert options[2] is not options[0]
+
+    @pytest.mark.asyncio
+    async def test_user_turn_slots_bound_concurrent_turns(self):
+        """Test that each user gets one bounded semaphore for their query turns."""
+        # Arrange
+        manager = SessionManager(max_turns_per_user=2)
+        slots = manager.user_turn_slots("busy-user")
+
+        # Act
+        await slots.acquire()
+        await slots.acquire()
+
+        # Assert
+        assert manager.user_turn_slots("busy-user") is slots
+        assert slots.locked()
+        assert not manager.user_turn_slots("other-user").locked()
+
+    @pytest.mark.asyncio
+    async def test_user_turn_slots_dropped_with_last_session(self):
+        """Test that a user's semaphore is forgotten once idle and their sessions are gone."""
+        # Arrange
+        manager = SessionManager()
+
+        with patch('app.services.session_manager.ClaudeSDKClient') as MockClient:
+            MockClient.side_effect = lambda options: AsyncMock(session_id=None)
+
+            for session_id in ("first-session", "second-session", "busy-session"):
+                user_id = "busy-user" if session_id == "busy-session" else "idle-user"
+                await manager.get_or_create_session(
+                    session_id=session_id, working_dir="/test/dir", user_id=user_id
+                )
+            idle_slots = manager.user_turn_slots("idle-user")
+            busy_slots = manager.user_turn_slots("busy-user")
+            manager.user_turn_slots("unknown-user")
+
+            # Act & Assert - kept while the user still has a session
+            await manager.cleanup_session("first-session")
+            assert manager._user_turn_slots["idle-user"] is idle_slots
+
+            await manager.cleanup_session("second-session")
+            assert "idle-user" not in manager._user_turn_slots
+
+            # Kept while a turn still holds it
+            async with busy_slots:
+                await manager.cleanup_session("busy-session")
+            assert manager._user_turn_slots["busy-user"] is busy_slots
+
+            await manager.shutdown()
+            assert manager._user_turn_slots == {}
+
     @pytest.mark.asyncio
     async def test_cleanup_session(self):
         """Test manual session cleanup."""
@@ -200,16 +333,17 @@ class TestSessionManager:
             )
 
             # Make session appear old
-            self.session_manager.active_sessions["old-session"]["last_used"] = time.time() - 120  # 2 minutes ago
+            old_session = self.session_manager.active_sessions["old-session"]
+            old_session.last_used = time.monotonic() - 120  # 2 minutes ago
 
             # Wait for cleanup to run (should be very quick in test)
             await asyncio.sleep(0.1)
 
             # Manually trigger cleanup check
-            current_time = time.time()
+            current_time = time.monotonic()
             sessions_to_remove = []
             for session_id, session_info in self.session_manager.active_sessions.items():
-                if current_time - session_info["last_used"] > self.session_manager.session_timeout:
+                if current_time - session_info.last_used > self.session_manager.session_timeout:
                     sessions_to_remove.append(session_id)
 
             for session_id in sessions_to_remove:
@@ -243,10 +377,198 @@ class TestSessionManager:
             assert stats["session_timeout_seconds"] == 60
             assert stats["cleanup_interval_seconds"] == 10
             assert "timestamp" in stats
-            assert "oldest_session_age_seconds" in stats
+            assert (
+                stats["newest_session_age_seconds"]
+                <= stats["average_session_age_seconds"]
+                <= stats["oldest_session_age_seconds"]
+            )
             assert "sessions_by_user" in stats
             assert len(stats["sessions_by_user"]) == 3
 
+    @pytest.mark.asyncio
+    async def test_session_stats_ages_and_users(self):
+        """Test session age statistics and per-user counts across distinct sessions."""
+        # Arrange
+        manager = SessionManager()
+
+        with patch('app.services.session_manager.ClaudeSDKClient') as MockClient:
+            MockClient.side_effect = lambda options: AsyncMock(session_id=None)
+
+            ages = {"alice-old": 30.0, "alice-new": 10.0, "bob-session": 20.0}
+            for session_id, age in ages.items():
+                await manager.get_or_create_session(
+                    session_id=session_id,
+                    working_dir="/test/dir",
+                    user_id=session_id.split("-")[0],
+                )
+                manager.active_sessions[session_id].created_at = time.monotonic() - age
+
+            # Act
+            stats = await manager.get_session_stats()
+
+            # Assert
+            assert stats["active_sessions"] == 3
+            assert stats["oldest_session_age_seconds"] == pytest.approx(30.0, abs=1.0)
+            assert stats["newest_session_age_seconds"] == pytest.approx(10.0, abs=1.0)
+            assert stats["average_session_age_seconds"] == pytest.approx(20.0, abs=1.0)
+            assert stats["sessions_by_user"] == {"alice": 2, "bob": 1}
+
+        # Cleanup
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_max_sessions_evicts_least_recently_used(self):
+        """Test that exceeding max_sessions evicts the longest idle session."""
+        # Arrange
+        manager = SessionManager(max_sessions=2)
+
+        with patch('app.services.session_manager.ClaudeSDKClient') as MockClient:
+            MockClient.side_effect = lambda options: AsyncMock(session_id=None)
+
+            # The older session is used again, leaving the newer one idle longest
+            for session_id in ("reused-session", "idle-session", "reused-session"):
+                await manager.get_or_create_session(
+                    session_id=session_id, working_dir="/test/dir", user_id="test-user"
+                )
+
+            # Act
+            await manager.get_or_create_session(
+                session_id="new-session", working_dir="/test/dir", user_id="test-user"
+            )
+
+            # Assert
+            assert list(manager.active_sessions) == ["reused-session", "new-session"]
+            stats = await manager.get_session_stats()
+            assert stats["evicted_sessions"] == 1
+
+        # Cleanup
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_cleanup_skips_sessions_mid_turn(self):
+        """Test that idle cleanup and eviction leave sessions with a running turn alone."""
+        # Arrange
+        manager = SessionManager(session_timeout=0, cleanup_interval=0.01, max_sessions=2)
+
+        with patch('app.services.session_manager.ClaudeSDKClient') as MockClient:
+            MockClient.side_effect = lambda options: AsyncMock(session_id=None)
+
+            for session_id in ("streaming-session", "idle-session"):
+                await manager.get_or_create_session(
+                    session_id=session_id, working_dir="/test/dir", user_id="test-user"
+                )
+            manager.active_sessions["streaming-session"].last_used -= 60
+
+            # Act
+            async with manager.turn_lock("streaming-session"):
+                await manager._evict_least_recently_used()
+                evicted = set(manager.active_sessions)
+                await asyncio.sleep(0.05)
+
+            # Assert
+            assert evicted == {"streaming-session"}
+            assert set(manager.active_sessions) == {"streaming-session"}
+
+        # Cleanup
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_cleanup_skips_session_picked_up_after_selection(self):
+        """Test that a turn started after a session is selected for cleanup keeps it alive."""
+        # Arrange
+        manager = SessionManager(session_timeout=300, cleanup_interval=300)
+
+        with patch('app.services.session_manager.ClaudeSDKClient') as MockClient:
+            MockClient.side_effect = lambda options: AsyncMock(session_id=None)
+
+            session_id = "selected-session"
+            await manager.get_or_create_session(
+                session_id=session_id, working_dir="/test/dir", user_id="test-user"
+            )
+            client = manager.active_sessions[session_id].client
+            manager.active_sessions[session_id].last_used -= 600
+
+            # Act - the turn starts before the gathered cleanup gets to run
+            cleanup = asyncio.create_task(
+                manager._cleanup_sessions([session_id], only_idle=True)
+            )
+            async with manager.turn_lock(session_id):
+                await cleanup
+
+                # Assert
+                assert session_id in manager.active_sessions
+                client.disconnect.assert_not_awaited()
+                assert manager._scheduled_expiry[session_id] > time.monotonic()
+
+        # Cleanup
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_cleanup_expires_only_idle_sessions(self):
+        """Test that the expiry heap removes idle sessions and reschedules used ones."""
+        # Arrange
+        manager = SessionManager(session_timeout=0.05, cleanup_interval=0.01)
+
+        with patch('app.services.session_manager.ClaudeSDKClient') as MockClient:
+            MockClient.side_effect = lambda options: AsyncMock(session_id=None)
+
+            for session_id in ("idle-session", "used-session"):
+                await manager.get_or_create_session(
+                    session_id=session_id, working_dir="/test/dir", user_id="test-user"
+                )
+
+            # Act - the used session is picked up again before its check comes due
+            manager.active_sessions["used-session"].last_used = time.monotonic() + 10
+            await asyncio.sleep(0.15)
+
+            # Assert
+            assert set(manager.active_sessions) == {"used-session"}
+            assert [sid for _, sid in manager._expiry_heap] == ["used-session"]
+
+        # Cleanup
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_cleanup_wakes_at_earliest_expiry(self):
+        """Test that cleanup runs when a session expires, not on the next interval tick."""
+        # Arrange
+        manager = SessionManager(session_timeout=0.05, cleanup_interval=300)
+
+        with patch('app.services.session_manager.ClaudeSDKClient') as MockClient:
+            MockClient.side_effect = lambda options: AsyncMock(session_id=None)
+
+            await manager.get_or_create_session(
+                session_id="short-session", working_dir="/test/dir", user_id="test-user"
+            )
+
+            # Act
+            await asyncio.sleep(0.15)
+
+            # Assert
+            assert manager.active_sessions == {}
+            assert manager._next_cleanup_delay(time.monotonic()) == 300
+
+        # Cleanup - shutdown must not wait out the sleeping loop
+        await asyncio.wait_for(manager.shutdown(), timeout=1.0)
+
+    @pytest.mark.asyncio
+    async def test_failed_connect_disconnects_client(self):
+        """Test that a client whose connect() fails is shut down, not leaked."""
+        # Arrange
+        with patch('app.services.session_manager.ClaudeSDKClient') as MockClient:
+            mock_client = AsyncMock()
+            mock_client.connect.side_effect = RuntimeError("CLI handshake failed")
+            MockClient.return_value = mock_client
+
+            # Act & Assert
+            with pytest.raises(RuntimeError, match="handshake failed"):
+                await self.session_manager.get_or_create_session(
+                    session_id="broken-session", working_dir="/test/dir", user_id="test-user"
+                )
+
+            mock_client.disconnect.assert_awaited_once()
+            assert "broken-session" not in self.session_manager.active_sessions
+
     @pytest.mark.asyncio
     async def test_shutdown_cleanup(self):
         """Test graceful shutdown cleanup."""
@@ -275,6 +597,99 @@ class TestSessionManager:
             # All clients should be disconnected
             assert mock_client.disconnect.call_count == 2
 
+    @pytest.mark.asyncio
+    async def test_shutdown_disconnects_clients_concurrently(self):
+        """Test that shutdown overlaps client disconnects instead of running them in turn."""
+        # Arrange
+        async def slow_disconnect():
+            await asyncio.sleep(0.1)
+
+        with patch('app.services.session_manager.ClaudeSDKClient') as MockClient:
+            MockClient.side_effect = lambda options: AsyncMock(
+                session_id=None, disconnect=AsyncMock(side_effect=slow_disconnect)
+            )
+
+            for i in range(5):
+                await self.session_manager.get_or_create_session(
+                    session_id=f"slow-session-{i}", working_dir="/test/dir", user_id="test-user"
+                )
+
+            # Act
+            started = time.monotonic()
+            await self.session_manager.shutdown()
+            elapsed = time.monotonic() - started
+
+            # Assert
+            assert self.session_manager.active_sessions == {}
+            assert elapsed < 0.3
+
+    @pytest.mark.asyncio
+    async def test_cancelled_cleanup_still_disconnects(self):
+        """Test that cancelling a cleanup does not abort the client disconnect."""
+        # Arrange
+        disconnected = asyncio.Event()
+
+        async def slow_disconnect():
+            await asyncio.sleep(0.05)
+            disconnected.set()
+
+        with patch('app.services.session_manager.ClaudeSDKClient') as MockClient:
+            MockClient.side_effect = lambda options: AsyncMock(
+                session_id=None, disconnect=AsyncMock(side_effect=slow_disconnect)
+            )
+            await self.session_manager.get_or_create_session(
+                session_id="closing-session", working_dir="/test/dir", user_id="test-user"
+            )
+
+            # Act
+            cleanup = asyncio.create_task(
+                self.session_manager.cleanup_session("closing-session")
+            )
+            await asyncio.sleep(0.01)
+            cleanup.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await cleanup
+
+            # Assert
+            await asyncio.wait_for(disconnected.wait(), timeout=1.0)
+
+        # Cleanup
+        await self.session_manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_cleanup_unregisters_before_disconnect(self):
+        """Test that a session being disconnected is no longer handed out or cleaned twice."""
+        # Arrange
+        async def slow_disconnect():
+            await asyncio.sleep(0.05)
+
+        with patch('app.services.session_manager.ClaudeSDKClient') as MockClient:
+            MockClient.side_effect = lambda options: AsyncMock(
+                session_id=None, disconnect=AsyncMock(side_effect=slow_disconnect)
+            )
+            old_client = await self.session_manager.get_or_create_session(
+                session_id="closing-session", working_dir="/test/dir", user_id="test-user"
+            )
+
+            # Act
+            cleanup = asyncio.create_task(
+                self.session_manager.cleanup_session("closing-session")
+            )
+            await asyncio.sleep(0)
+            second_cleanup = await self.session_manager.cleanup_session("closing-session")
+            new_client = await self.session_manager.get_or_create_session(
+                session_id="closing-session", working_dir="/test/dir", user_id="test-user"
+            )
+
+            # Assert
+            assert await cleanup is True
+            assert second_cleanup is False
+            assert new_client is not old_client
+            assert self.session_manager.active_sessions["closing-session"].client is new_client
+
+        # Cleanup
+        await self.session_manager.shutdown()
+
     @pytest.mark.asyncio
     async def test_session_user_tracking(self):
         """Test session user ID tracking."""
@@ -7,8 +7,10 @@ and session resumption with ClaudeSDKClient integration.
 
 import pytest
 import asyncio
+import json
 import tempfile
 import os
+from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -32,8 +34,8 @@ class TestSessionPersistence:
         yield storage
 
         # Cleanup
-        if storage_file.exists():
-            storage_file.unlink()
+        storage_file.unlink(missing_ok=True)
+        storage.journal_file.unlink(missing_ok=True)
 
     @pytest.fixture
     def temp_working_dir(self):
@@ -149,8 +151,8 @@ class TestSessionPersistence:
                 session1_info = session_manager.active_sessions["session-dir1"]
                 session2_info = session_manager.active_sessions["session-dir2"]
 
-                assert session1_info["working_dir"] == str(working_dir1)
-                assert session2_info["working_dir"] == str(working_dir2)
+                assert session1_info.working_dir == str(working_dir1)
+                assert session2_info.working_dir == str(working_dir2)
 
                 # Verify ClaudeSDKClient was created with correct working directories
                 assert MockClient.call_count == 2
@@ -164,6 +166,33 @@ class TestSessionPersistence:
             # Cleanup
             await session_manager.shutdown()
 
+    @pytest.mark.asyncio
+    async def test_missing_working_directory_rejected(self, temp_session_storage, temp_working_dir):
+        """Test that missing or non-directory working directories are rejected."""
+        # Arrange
+        session_manager = SessionManager()
+        claude_service = ClaudeService(temp_working_dir, temp_session_storage, session_manager)
+        missing_dir = temp_working_dir / "missing"
+
+        with patch('app.services.session_manager.ClaudeSDKClient') as MockClient:
+            MockClient.return_value = AsyncMock(session_id="valid-dir-session")
+            await claude_service.create_session(
+                SessionRequest(user_id="dir-user", working_directory=str(temp_working_dir))
+            )
+
+            not_a_dir = temp_working_dir / "file.txt"
+            not_a_dir.write_text("not a directory")
+
+            # Act & Assert
+            for bad_dir in (missing_dir, not_a_dir):
+                with pytest.raises(ValueError, match="does not exist"):
+                    await claude_service.create_session(
+                        SessionRequest(user_id="dir-user", working_directory=str(bad_dir))
+                    )
+
+        # Cleanup
+        await session_manager.shutdown()
+
     @pytest.mark.asyncio
     async def test_session_resumption_with_context(self, temp_session_storage, temp_working_dir):
         """Test session resumption maintains conversation context."""
@@ -361,6 +390,306 @@ class TestSessionPersistence:
         # Cleanup
         await session_manager.shutdown()
 
+    @pytest.mark.asyncio
+    async def test_warm_recent_sessions(self, temp_session_storage, temp_working_dir):
+        """Test that recently used sessions get a connected client at startup."""
+        # Arrange
+        temp_session_storage.store_session(
+            session_id="warm-session",
+            user_id="warm-user",
+            working_directory=str(temp_working_dir),
+        )
+        session_manager = SessionManager()
+        claude_service = ClaudeService(temp_working_dir, temp_session_storage, session_manager)
+
+        with patch('app.services.session_manager.ClaudeSDKClient') as MockClient:
+            mock_client = AsyncMock()
+            mock_client.session_id = "warm-session"
+            MockClient.return_value = mock_client
+
+            # Act
+            warmed = await claude_service.warm_recent_sessions(since_seconds=600)
+
+            # Assert
+            assert warmed == 1
+            assert session_manager.is_session_active("warm-session")
+            mock_client.connect.assert_called_once()
+
+        # Cleanup
+        await session_manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_session_context_is_shared_and_read_only(
+        self, temp_session_storage, temp_working_dir
+    ):
+        """Test that sessions in one working directory share a read-only context."""
+        # Arrange
+        for session_id in ("ctx-1", "ctx-2"):
+            temp_session_storage.store_session(
+                session_id=session_id,
+                user_id="ctx-user",
+                working_directory=str(temp_working_dir),
+            )
+        claude_service = ClaudeService(temp_working_dir, temp_session_storage, SessionManager())
+
+        # Act
+        first, second = await claude_service.list_user_sessions("ctx-user")
+
+        # Assert
+        assert first.context == {"working_directory": str(temp_working_dir)}
+        assert first.context is second.context
+        with pytest.raises(TypeError):
+            first.context["working_directory"] = "/elsewhere"
+        assert '"working_directory"' in first.model_dump_json()
+
+    def test_user_session_index(self, temp_session_storage, temp_working_dir):
+        """Test that per-user listings follow stores and removals across reloads."""
+        # Arrange
+        for session_id, user_id in [("a-1", "alice"), ("b-1", "bob"), ("a-2", "alice")]:
+            temp_session_storage.store_session(
+                session_id=session_id,
+                user_id=user_id,
+                working_directory=str(temp_working_dir),
+            )
+
+        # Act
+        temp_session_storage.remove_session("a-1")
+        reloaded = PersistentSessionStorage(temp_session_storage.storage_file)
+
+        # Assert
+        for storage in (temp_session_storage, reloaded):
+            alice_sessions = storage.list_user_sessions("alice")
+            assert [s["session_id"] for s in alice_sessions] == ["a-2"]
+            bob_sessions = storage.list_user_sessions("bob")
+            assert [s["session_id"] for s in bob_sessions] == ["b-1"]
+            assert storage.list_user_sessions("nobody") == []
+            assert storage.count_user_sessions("alice") == 1
+            assert storage.count_user_sessions("nobody") == 0
+            assert storage.get_storage_stats()["unique_users"] == 2
+
+    @pytest.mark.asyncio
+    async def test_get_session_raw_matches_session_response(
+        self, temp_session_storage, temp_working_dir
+    ):
+        """Test that the raw session dict serializes like SessionResponse and checks ownership."""
+        # Arrange
+        temp_session_storage.store_session(
+            session_id="raw-session",
+            user_id="alice",
+            working_directory=str(temp_working_dir),
+            session_name="Raw",
+        )
+        claude_service = ClaudeService(temp_working_dir, temp_session_storage, SessionManager())
+
+        # Act
+        raw = await claude_service.get_session_raw("raw-session", "alice")
+        model = await claude_service.get_session("raw-session", "alice")
+
+        # Assert
+        assert raw == model.model_dump(mode="json")
+        assert await claude_service.get_session_raw("raw-session", "mallory") is None
+        assert await claude_service.get_session_raw("missing", "alice") is None
+
+    def test_user_sessions_paginate_newest_first(self, temp_session_storage, temp_working_dir):
+        """Test that listings page newest first, even when stored out of order."""
+        # Arrange
+        base = datetime(2025, 1, 1)
+        for day in (3, 1, 4, 2, 5):
+            temp_session_storage.store_session(
+                session_id=f"day-{day}",
+                user_id="alice",
+                working_directory=str(temp_working_dir),
+                created_at=base + timedelta(days=day),
+            )
+
+        # Act
+        pages = [
+            [s["session_id"] for s in temp_session_storage.list_user_sessions("alice", 2, offset)]
+            for offset in (0, 2, 4)
+        ]
+
+        # Assert
+        assert pages == [["day-5", "day-4"], ["day-3", "day-2"], ["day-1"]]
+
+    def test_queued_touches_flush_in_one_write(self, temp_session_storage, temp_working_dir):
+        """Test that queued touches are persisted together by flush_touches()."""
+        # Arrange
+        created = datetime.utcnow() - timedelta(days=2)
+        for session_id in ("touch-1", "touch-2"):
+            temp_session_storage.store_session(
+                session_id=session_id,
+                user_id="alice",
+                working_directory=str(temp_working_dir),
+                created_at=created,
+            )
+            data = temp_session_storage._read_storage()
+            data[session_id]["updated_at"] = created.isoformat()
+            temp_session_storage._write_storage(data)
+
+        # Act
+        for session_id in ("touch-1", "touch-2", "touch-1", "missing"):
+            temp_session_storage.queue_touch(session_id)
+        before_flush = temp_session_storage.get_session("touch-1")["updated_at"]
+        with patch.object(
+            temp_session_storage, "_append_journal", wraps=temp_session_storage._append_journal
+        ) as append_journal:
+            touched = temp_session_storage.flush_touches()
+
+        # Assert
+        assert before_flush == created.isoformat()
+        assert touched == 2
+        append_journal.assert_called_once()
+        for session_id in ("touch-1", "touch-2"):
+            updated_at = temp_session_storage.get_session(session_id)["updated_at"]
+            assert updated_at > created.isoformat()
+        assert temp_session_storage.flush_touches() == 0
+
+    def test_failed_touch_flush_is_retried(self, temp_session_storage, temp_working_dir):
+        """Test that touches stay queued when the journal append fails."""
+        # Arrange
+        temp_session_storage.store_session(
+            session_id="touch-retry",
+            user_id="alice",
+            working_directory=str(temp_working_dir),
+        )
+        temp_session_storage.queue_touch("touch-retry")
+        touched_at = temp_session_storage._pending_touches["touch-retry"]
+
+        # Act
+        with patch.object(
+            temp_session_storage, "_append_journal", side_effect=OSError("disk full")
+        ):
+            failed = temp_session_storage.flush_touches()
+        pending = dict(temp_session_storage._pending_touches)
+        retried = temp_session_storage.flush_touches()
+
+        # Assert
+        assert failed == 0
+        assert pending == {"touch-retry": touched_at}
+        assert retried == 1
+        assert temp_session_storage._pending_touches == {}
+
+    def test_storage_reads_cached_until_file_changes(
+        self, temp_session_storage, temp_working_dir
+    ):
+        """Test that parsed storage is reused until another writer changes the file."""
+        # Arrange
+        temp_session_storage.store_session(
+            session_id="cached-1",
+            user_id="alice",
+            working_directory=str(temp_working_dir),
+        )
+        other_worker = PersistentSessionStorage(temp_session_storage.storage_file)
+
+        # Act
+        first_read = temp_session_storage._read_storage()
+        second_read = temp_session_storage._read_storage()
+        other_worker.store_session(
+            session_id="cached-2",
+            user_id="alice",
+            working_directory=str(temp_working_dir),
+            session_name="Written by another worker",
+        )
+
+        # Assert
+        assert first_read is second_read
+        assert temp_session_storage.get_session("cached-2") is not None
+        alice_sessions = temp_session_storage.list_user_sessions("alice")
+        assert {s["session_id"] for s in alice_sessions} == {"cached-1", "cached-2"}
+
+    def test_writes_append_to_journal_until_compacted(
+        self, temp_session_storage, temp_working_dir
+    ):
+        """Test that writes go to the journal, survive a reload, and compact into the snapshot."""
+        # Arrange
+        storage = temp_session_storage
+        storage.store_session(
+            session_id="journal-1", user_id="alice", working_directory=str(temp_working_dir)
+        )
+        snapshot = storage.storage_file.read_bytes()
+
+        # Act
+        storage.store_session(
+            session_id="journal-2", user_id="alice", working_directory=str(temp_working_dir)
+        )
+        storage.remove_session("journal-1")
+        reloaded = PersistentSessionStorage(storage.storage_file)
+
+        # Assert
+        assert storage.storage_file.read_bytes() == snapshot
+        assert len(storage.journal_file.read_bytes().splitlines()) == 3
+        for current in (storage, reloaded):
+            assert [s["session_id"] for s in current.list_user_sessions("alice")] == [
+                "journal-2"
+            ]
+
+        # Act - the next write pushes the journal over the compaction threshold
+        with patch("app.utils.session_storage._JOURNAL_COMPACT_BYTES", 1):
+            storage.store_session(
+                session_id="journal-3", user_id="alice", working_directory=str(temp_working_dir)
+            )
+
+        # Assert
+        assert storage.journal_file.read_bytes() == b""
+        assert set(json.loads(storage.storage_file.read_text())) == {"journal-2", "journal-3"}
+        assert reloaded.count_user_sessions("alice") == 2
+
+    def test_cleanup_old_sessions_by_creation_date(self, temp_session_storage, temp_working_dir):
+        """Test that only sessions created before the cutoff are removed."""
+        # Arrange
+        now = datetime.utcnow()
+        for session_id, age_days in [("old-1", 45), ("recent-1", 5), ("recent-2", 0)]:
+            temp_session_storage.store_session(
+                session_id=session_id,
+                user_id="alice",
+                working_directory=str(temp_working_dir),
+                created_at=now - timedelta(days=age_days),
+            )
+
+        # Act
+        removed = temp_session_storage.cleanup_old_sessions(max_age_days=30)
+
+        # Assert
+        assert removed == 1
+        assert temp_session_storage.get_session("old-1") is None
+        assert temp_session_storage.count_user_sessions("alice") == 2
+
+    def test_storage_results_do_not_alias_cache(self, temp_session_storage, temp_working_dir):
+        """Test that callers mutating returned metadata leave the cache intact."""
+        # Arrange
+        temp_session_storage.store_session(
+            session_id="alias-1",
+            user_id="alice",
+            working_directory=str(temp_working_dir),
+        )
+
+        # Act
+        temp_session_storage.get_session("alias-1")["user_id"] = "mallory"
+        temp_session_storage.list_user_sessions("alice")[0]["session_name"] = "Changed"
+
+        # Assert
+        stored = temp_session_storage.get_session("alias-1")
+        assert stored["user_id"] == "alice"
+        assert stored["session_name"] != "Changed"
+
+    def test_failed_read_drops_cache_and_index(self, temp_session_storage, temp_working_dir):
+        """Test that an unreadable storage file leaves no stale sessions or counts behind."""
+        # Arrange
+        temp_session_storage.store_session(
+            session_id="lost-1",
+            user_id="alice",
+            working_directory=str(temp_working_dir),
+        )
+        assert temp_session_storage.count_user_sessions("alice") == 1
+
+        # Act
+        temp_session_storage.storage_file.write_text("{not json")
+
+        # Assert
+        assert temp_session_storage.count_user_sessions("alice") == 0
+        assert temp_session_storage.list_user_sessions("alice") == []
+        assert temp_session_storage.get_session("lost-1") is None
+
     @pytest.mark.asyncio
     async def test_storage_corruption_recovery(self, temp_working_dir):
         """Test recovery from corrupted session storage."""
@@ -403,8 +732,8 @@ class TestSessionPersistence:
             await session_manager.shutdown()
 
         finally:
-            if storage_file.exists():
-                storage_file.unlink()
+            storage_file.unlink(missing_ok=True)
+            storage_file.with_suffix(".wal").unlink(missing_ok=True)
 
     @pytest.mark.asyncio
     async def test_working_directory_path_hashing(self, temp_session_storage):
@@ -439,7 +768,7 @@ class TestSessionPersistence:
 
                 # Verify working directory is stored correctly
                 session_info = session_manager.active_sessions[f"path-session-{i}"]
-                assert session_info["working_dir"] == path
+                assert session_info.working_dir == path
 
                 # Verify ClaudeSDKClient was created with original path
                 call_options = MockClient.call_args[0][0]